@@ -0,0 +1,58 @@
+# Compares validated and trusted build_model_from_row on market rows, run from the repo root: python -m benchmarks.build_model_from_row
+import argparse
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from core.database.helpers import build_model_from_row
+from core.enums.statuses import BottifyStatus
+from core.models.market import MarketModel
+
+
+def make_market_rows(count: int):
+    now = datetime.now(tz=timezone.utc)
+    return [
+        {
+            "id": i,
+            "base_currency_id": i % 500 + 1,
+            "quote_currency_id": 1,
+            "exchange_id": i % 3 + 1,
+            "symbol": f"CUR{i}-USD",
+            "min_trade_size": Decimal("0.00100000"),
+            "status": BottifyStatus.Active.value,
+            "notice": None,
+            "tags": ["defi", "layer-1"],
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(count)
+    ]
+
+
+def time_build(rows, trusted: bool, rounds: int):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for row in rows:
+            build_model_from_row(row, MarketModel, trusted=trusted)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    rows = make_market_rows(args.rows)
+    validated = time_build(rows, False, args.rounds)
+    trusted = time_build(rows, True, args.rounds)
+    print(f"Rows {args.rows} : Best of {args.rounds} Rounds")
+    print(f"Validated : {validated * 1000:.1f} ms : {validated / args.rows * 1e6:.2f} us/row")
+    print(f"Trusted   : {trusted * 1000:.1f} ms : {trusted / args.rows * 1e6:.2f} us/row")
+    print(f"Speedup   : {validated / trusted:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Compares bulk body encoding of Coinbase public trades, run from the repo root: python -m benchmarks.bulk_serialization
+# No cluster is needed, each path builds the newline delimited bulk body the indexer would send
+import argparse
+import time
+from datetime import datetime, timezone, timedelta
+from decimal import Decimal
+from elasticsearch.helpers import expand_action
+from elasticsearch.serializer import JSONSerializer
+
+from core.exchanges.coinbase.models import CoinbasePublicTradeModel
+from core.elasticsearch.bulk import BulkIndexer
+from core.feeds.helpers import serialized_action
+
+
+def make_trades(count: int):
+    start = datetime.now(tz=timezone.utc)
+    return [
+        CoinbasePublicTradeModel(
+            trade_id=i + 1,
+            market_symbol="BTC-USD",
+            time=start + timedelta(milliseconds=i),
+            price=Decimal("43210.12") + Decimal(i % 100) / 100,
+            size=Decimal("0.00123456"),
+            side="buy" if i % 2 else "sell",
+        )
+        for i in range(count)
+    ]
+
+
+# The old path, dicts from the generator encoded by the client's default serializer
+def build_body_stdlib(trades, serializer):
+    lines = []
+    for trade in trades:
+        op, data = expand_action(trade.dict(by_alias=True))
+        lines.append(serializer.dumps(op))
+        lines.append(serializer.dumps(data))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def build_body_indexer(actions, indexer):
+    return b"".join(
+        b"\n".join(lines) + b"\n"
+        for chunk in indexer.chunk_actions(actions)
+        for lines in chunk
+    )
+
+
+def time_best(build, rounds: int):
+    best, size = None, 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        size = len(build())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    trades = make_trades(args.docs)
+    indexer = BulkIndexer(client=None, index_name="benchmark")
+    results = {
+        "stdlib json, dicts": time_best(
+            lambda: build_body_stdlib(trades, JSONSerializer()), args.rounds
+        ),
+        "orjson, dicts": time_best(
+            lambda: build_body_indexer(
+                (trade.dict(by_alias=True) for trade in trades), indexer
+            ),
+            args.rounds,
+        ),
+        "orjson, pre-serialized": time_best(
+            lambda: build_body_indexer(
+                (serialized_action(trade) for trade in trades), indexer
+            ),
+            args.rounds,
+        ),
+    }
+    baseline = results["stdlib json, dicts"][0]
+    print(f"Docs {args.docs} : Best of {args.rounds} Rounds")
+    for name, (elapsed, size) in results.items():
+        print(
+            f"{name:<24} : {elapsed * 1000:.1f} ms : {elapsed / args.docs * 1e6:.2f} us/doc : {size / 1e6:.1f} MB : {baseline / elapsed:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import logging
+from databases import Database
+
+from core.config import settings
+from core.database.crud.monitor import read_monitor_by_source_id
+from core.database.crud.subscription import read_subscriptions_by_monitor_id
+from core.utils.cache import TTLCache
+from core.utils.pubsub import MonitorCacheChannel, start_invalidation_listener
+
+# Keyed by monitor source_id, holds (MonitorModel, [SubscriptionModel]) for the alert webhook
+monitor_cache = TTLCache(settings.MonitorCacheTtlSeconds)
+
+
+def invalidate_monitor_cache(source_id: str = None):
+    monitor_cache.invalidate(source_id)
+
+
+async def read_cached_monitor_subscriptions(database: Database, source_id: str):
+    cached = monitor_cache.get(source_id)
+    if cached:
+        return cached
+    # The listener thread can invalidate while the reads are awaited, the generation check keeps that result out of the cache
+    generation = monitor_cache.generation
+    monitor = await read_monitor_by_source_id(database, source_id)
+    if not monitor:
+        return None, []
+    subscriptions = await read_subscriptions_by_monitor_id(database, monitor.id)
+    monitor_cache.set_if_generation(source_id, (monitor, subscriptions), generation)
+    return monitor, subscriptions
+
+
+# Workers publish the source_id of monitors they sync, a None key (listener reconnected) drops everything
+def start_monitor_cache_listener():
+    return start_invalidation_listener(MonitorCacheChannel, invalidate_monitor_cache)
@@ -1,6 +1,9 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Header
+from celery import group
+from pydantic import ValidationError
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Header
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 from databases import Database
 from typing import Optional, List
@@ -8,8 +11,7 @@ from core.config import settings
 from core.enums.statuses import BottifyStatus
 from core.database.database import get_db
 from core.database.crud.alert import read_all_alerts, create_alert, read_alert_by_id
-from core.database.crud.monitor import read_monitor_by_source_id
-from core.database.crud.subscription import read_subscriptions_by_monitor_id
+from core.api.cache import read_cached_monitor_subscriptions
 from core.models.alert import AlertInModel, AlertModel, AlertCreateModel
 from core.models.user import BottifyUserModel
 from core.security.login_helpers import authenticate_user, user_is_god, authenticate_god
@@ -22,9 +24,45 @@ def alert_secret_key_is_valid(sk_in: str):
     return True if sk_in == settings.AlertSecretKey else False
 
 
+# A group publishes every reaction through one producer connection instead of a broker round trip per subscription
+def send_reaction_tasks(subscriptions: list, alert_json: str):
+    reactions = group(
+        bottify_worker.signature(
+            "core.worker.handle_reaction",
+            kwargs={
+                "reaction_id": subscription.reaction_id,
+                "strategy_id": subscription.strategy_id,
+                "alert_in": alert_json,
+            },
+            queue=settings.CeleryTradeTaskQueue,
+        )
+        for subscription in subscriptions
+    )
+    reactions.apply_async()
+
+
+# Runs after the webhook has responded, the broker publish is blocking so it goes to the threadpool rather than the event loop
+async def enqueue_alert_reactions(
+    monitor_id: int, subscriptions: list, alert: AlertInModel
+):
+    if not subscriptions:
+        return
+    try:
+        await run_in_threadpool(send_reaction_tasks, subscriptions, alert.json())
+    except Exception as e:
+        logging.error(
+            f"Alert Webhook : Failed to Enqueue Reactions : Monitor ID {monitor_id} : Subscriptions {len(subscriptions)} : Error {e}"
+        )
+        return
+    logging.info(
+        f"Alert Webhook : Enqueued Reactions : Monitor ID {monitor_id} : Subscriptions {len(subscriptions)}"
+    )
+
+
 @router.post("/alert/hook")
 async def indicator_alert_webhook(
     alert_in: AlertCreateModel,
+    background_tasks: BackgroundTasks,
     x_bottify_sec: Optional[str] = Header(None),
     database: Database = Depends(get_db),
 ):
@@ -42,7 +80,9 @@ async def indicator_alert_webhook(
             status_code=400,
             detail="It's Unclear What You're Trying to do...But it didn't work.",
         )
-    monitor = await read_monitor_by_source_id(database, alert_in.source_id)
+    monitor, subscriptions = await read_cached_monitor_subscriptions(
+        database, alert_in.source_id
+    )
     if not monitor:
         logging.error(
             f"Alert Webhook : No Monitor Found for Source ID : Source ID {str(alert_in.source_id)}"
@@ -67,16 +107,10 @@ async def indicator_alert_webhook(
     success = await create_alert(database, new_alert)
     if not success:
         raise HTTPException(status_code=400, detail=f"Failed to Create Alert")
-    subscriptions = await read_subscriptions_by_monitor_id(database, monitor.id)
-    for subscription in subscriptions:
-        params = {
-            "reaction_id": subscription.reaction_id,
-            "strategy_id": subscription.strategy_id,
-            "alert_in": new_alert.json(),
-        }
-        bottify_worker.send_task(
-            "core.worker.handle_reaction", kwargs=params, queue="trade_tasks"
-        )
+    # The alert is stored, reactions are fanned out after the response is sent
+    background_tasks.add_task(
+        enqueue_alert_reactions, monitor.id, subscriptions, new_alert
+    )
     return JSONResponse(content={"success": success})
 
 
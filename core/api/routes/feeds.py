@@ -106,8 +106,7 @@ async def put_feed_configs(
     user: BottifyUserModel = Depends(authenticate_god),
     database: Database = Depends(get_db),
 ):
-    feed = await read_feed_by_id(database, feed_id)
-    if not feed:
-        raise HTTPException(status_code=404, detail="Feed Not Found")
     success = await update_feed_configs(database, feed_id, configs)
+    if not success:
+        raise HTTPException(status_code=404, detail="Feed Not Found")
     return JSONResponse(content={"success": success})
@@ -6,6 +6,7 @@ from fastapi.responses import JSONResponse
 from databases import Database
 from typing import List, Optional
 from core.worker import bottify_worker
+from core.api.cache import invalidate_monitor_cache
 from core.database.database import get_db
 from core.models.user import BottifyUserModel
 from core.enums.statuses import BottifyStatus
@@ -43,6 +44,7 @@ async def post_monitor(
     database: Database = Depends(get_db),
 ):
     created = await create_monitor(database, monitor_in)
+    invalidate_monitor_cache(monitor_in.source_id)
     if not created:
         raise HTTPException(
             status_code=400,
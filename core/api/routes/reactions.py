@@ -18,6 +18,7 @@ from core.database.crud.reaction import (
     create_reaction,
 )
 from core.database.crud.strategy import read_user_strategies
+from core.api.cache import invalidate_monitor_cache
 
 router = APIRouter()
 
@@ -31,6 +32,7 @@ async def post_reaction(
     try:
         rim = ReactionInModel(**reaction_in.dict())
         success = await create_reaction(database, rim)
+        invalidate_monitor_cache()
     except ValidationError as ve:
         logging.error(f"Post Reaction : ValidationError : Data {ve.json()}")
         success = False
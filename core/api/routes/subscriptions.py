@@ -15,6 +15,7 @@ from core.database.crud.subscription import (
     create_subscription,
 )
 from core.database.crud.strategy import read_user_strategies
+from core.api.cache import invalidate_monitor_cache
 
 router = APIRouter()
 
@@ -27,6 +28,7 @@ async def post_subscription(
 ):
 
     success = await create_subscription(database, subscription_in)
+    invalidate_monitor_cache()  # Only the monitor ID is known here, subscription writes are rare enough to drop everything
     return JSONResponse(content={"success": success})
 
 
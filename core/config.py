@@ -87,6 +87,49 @@ class BottifySettings(BaseSettings):
     CeleryTradeTaskQueue: str = "trade_tasks"
     CeleryFeedTaskQueue: str = "feed_tasks"
 
+    # Shared connection pool opened once per Celery worker process
+    WorkerDatabaseMinSize: int = 1
+    WorkerDatabaseMaxSize: int = 5
+
+    # Keep-alive connection pool used by the async exchange clients, per exchange host
+    ExchangeConnectionLimit: int = 20
+    ExchangeKeepAliveSeconds: int = 30
+
+    # Maximum open orders refreshed at once against a single exchange
+    OpenOrderRefreshConcurrency: int = 5
+
+    # Currencies rarely change, symbol and ID lookups are cached in process for this long
+    CurrencyCacheTtlSeconds: int = 300
+
+    # Markets fetched at once by a feed result generator, feeds can override with the max_workers config
+    FeedFetchMaxWorkers: int = 8
+
+    # Feed scheduler reloads the schedule from the database this often, feeds dispatched but never picked up are resent after the redispatch window
+    FeedSchedulerSyncSeconds: int = 15
+    FeedSchedulerRedispatchSeconds: int = 600
+
+    # How long a claimed feed stays Busy before another worker may reclaim it, must exceed the slowest feed refresh
+    FeedLeaseSeconds: int = 1800
+    # A refresh that raised is retried this long after the failure instead of on its normal interval, so a failing exchange isn't hammered every sync
+    FeedRetryBackoffSeconds: int = 300
+    # Each scheduled refresh task claims up to this many overdue feeds with SKIP LOCKED and refreshes them one after another
+    FeedClaimBatchSize: int = 1
+
+    # Feed results are bulk indexed in chunks capped by document count and bytes, several chunks are sent concurrently and 429s back off exponentially up to the max
+    ElasticBulkChunkSize: int = 500
+    ElasticBulkMaxChunkBytes: int = 5 * 1024 * 1024
+    ElasticBulkThreadCount: int = 4
+    ElasticBulkMaxRetries: int = 3
+    ElasticBulkInitialBackoff: float = 2
+    ElasticBulkMaxBackoff: float = 600
+    # Feeds can set op_type in their configs, "create" skips documents already indexed under the same natural key _id, "index" overwrites them
+    ElasticBulkOpType: str = "index"
+    # Result model fields hinted es_type="scaled_float" are stored as longs of value * factor, 8 decimal places covers satoshis
+    ElasticScalingFactor: int = 100000000
+
+    # Alert webhook caches monitors and their subscriptions, writes invalidate immediately so this is only a safety net
+    MonitorCacheTtlSeconds: int = 300
+
     Region: str = "us-west-2"
     ServerHost: IPvAnyAddress = "0.0.0.0"
     Port: int = 8080
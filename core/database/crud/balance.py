@@ -2,7 +2,9 @@ import logging
 
 from databases import Database
 from decimal import Decimal
+from typing import List
 from sqlalchemy import and_
+from sqlalchemy.dialects.postgresql import insert
 from core.database.helpers import build_model_from_row, write_db
 from core.database.tables.balance import get_balance_table
 from core.models.balance import CurrencyBalanceInModel, CurrencyBalanceModel
@@ -46,10 +48,8 @@ async def read_balance_by_id(database: Database, balance_id: int):
     return build_model_from_row(row, CurrencyBalanceModel)
 
 
-async def read_balance_by_currency_exchange(
-    database: Database, currency_id: int, exchange_id: int
-):
-    query = (
+def read_balance_by_currency_exchange_query(currency_id: int, exchange_id: int):
+    return (
         balance_table.select()
         .where(
             and_(
@@ -59,6 +59,12 @@ async def read_balance_by_currency_exchange(
         )
         .limit(1)
     )
+
+
+async def read_balance_by_currency_exchange(
+    database: Database, currency_id: int, exchange_id: int
+):
+    query = read_balance_by_currency_exchange_query(currency_id, exchange_id)
     row = await database.fetch_one(query)
     return build_model_from_row(row, CurrencyBalanceModel)
 
@@ -133,3 +139,36 @@ async def update_balance(
     )
     await database.execute(query)
     return True
+
+
+# Writes every balance for an exchange in one statement, relies on balance_uc (currency_id, exchange_id)
+async def upsert_balances(
+    database: Database, balances_in: List[CurrencyBalanceInModel]
+):
+    if not isinstance(balances_in, list):
+        logging.error(
+            f"Upsert Balances : Input Must be a List of CurrencyBalanceInModels : Got {type(balances_in)}"
+        )
+        return False
+    values = {}
+    for balance_in in balances_in:
+        if not isinstance(balance_in, CurrencyBalanceInModel):
+            logging.error(
+                f"Upsert Balances : Input Must be a CurrencyBalanceInModel : Got {type(balance_in)}"
+            )
+            return False
+        # Postgres rejects an upsert that touches the same row twice, last balance for a currency wins
+        values[(balance_in.currency_id, balance_in.exchange_id)] = balance_in.dict()
+    if not values:
+        return True
+    query = insert(balance_table).values(list(values.values()))
+    query = query.on_conflict_do_update(
+        constraint="balance_uc",
+        set_={
+            "available": query.excluded.available,
+            "reserved": query.excluded.reserved,
+            "updated_at": query.excluded.updated_at,
+        },
+    )
+    await database.execute(query)
+    return True
@@ -59,14 +59,18 @@ async def read_orders_by_status(database: Database, order_status: BottifyStatus)
     return orders
 
 
-async def read_open_orders(database: Database):
-    orders = []
-    query = order_table.select().where(
+def read_open_orders_query():
+    return order_table.select().where(
         or_(
             order_table.c.status == BottifyStatus.Active.value,
             order_table.c.status == BottifyStatus.New.value,
         )
     )
+
+
+async def read_open_orders(database: Database):
+    orders = []
+    query = read_open_orders_query()
     async for row in database.iterate(query):
         orders.append(build_model_from_row(row, BottifyOrderModel))
     if not orders:
@@ -47,10 +47,10 @@ async def read_budget_by_id(database: Database, budget_id: int):
     return build_model_from_row(row, BudgetModel)
 
 
-async def read_budget_by_currency_exchange_strategy(
-    database: Database, currency_id: int, exchange_id: int, strategy_id: int
+def read_budget_by_currency_exchange_strategy_query(
+    currency_id: int, exchange_id: int, strategy_id: int
 ):
-    query = (
+    return (
         budget_table.select()
         .where(
             and_(
@@ -61,6 +61,14 @@ async def read_budget_by_currency_exchange_strategy(
         )
         .limit(1)
     )
+
+
+async def read_budget_by_currency_exchange_strategy(
+    database: Database, currency_id: int, exchange_id: int, strategy_id: int
+):
+    query = read_budget_by_currency_exchange_strategy_query(
+        currency_id, exchange_id, strategy_id
+    )
     row = await database.fetch_one(query)
     return build_model_from_row(row, BudgetModel)
 
@@ -1,14 +1,35 @@
 import logging
 
 from databases import Database
+from typing import Dict, Iterable
 
+from core.config import settings
 from core.database.helpers import build_model_from_row, write_db
+from core.utils.cache import TTLCache
 from core.models.currency import CurrencyInModel, CurrencyModel
 
 from core.database.tables.currency import get_currency_table
 
 currency_table = get_currency_table()
 
+# Keyed by ("id", currency_id), ("symbol", symbol) and "symbol_map", misses are not cached so new currencies show up immediately
+currency_cache = TTLCache(settings.CurrencyCacheTtlSeconds)
+
+
+def invalidate_currency_cache():
+    currency_cache.invalidate()
+
+
+def get_currency_cache_stats():
+    return currency_cache.stats
+
+
+def cache_currency(currency: CurrencyModel):
+    if currency:
+        currency_cache.set(("id", currency.id), currency)
+        currency_cache.set(("symbol", currency.symbol), currency)
+    return currency
+
 
 async def create_currency(database: Database, currency_in: CurrencyInModel):
     if not isinstance(currency_in, CurrencyInModel):
@@ -17,7 +38,9 @@ async def create_currency(database: Database, currency_in: CurrencyInModel):
         )
         return False
     query = currency_table.insert()
-    return await write_db(database, query, currency_in.dict())
+    success = await write_db(database, query, currency_in.dict())
+    invalidate_currency_cache()
+    return success
 
 
 async def read_currency_by_id(database: Database, currency_id: int):
@@ -26,9 +49,16 @@ async def read_currency_by_id(database: Database, currency_id: int):
             f"Read Currency by ID : Currency ID Must be an Integer : Got {type(currency_id)}"
         )
         return None
+    currency = currency_cache.get(("id", currency_id))
+    if currency:
+        return currency
     query = currency_table.select().where(currency_table.c.id == currency_id).limit(1)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, CurrencyModel)
+    return cache_currency(build_model_from_row(row, CurrencyModel))
+
+
+def read_currency_by_symbol_query(symbol: str):
+    return currency_table.select().where(currency_table.c.symbol == symbol).limit(1)
 
 
 async def read_currency_by_symbol(database: Database, symbol: str):
@@ -37,9 +67,33 @@ async def read_currency_by_symbol(database: Database, symbol: str):
             f"Read Currency by Symbol : Symbol Must be a String : Got {type(symbol)}"
         )
         return None
-    query = currency_table.select().where(currency_table.c.symbol == symbol).limit(1)
+    currency = currency_cache.get(("symbol", symbol))
+    if currency:
+        return currency
+    query = read_currency_by_symbol_query(symbol)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, CurrencyModel)
+    return cache_currency(build_model_from_row(row, CurrencyModel))
+
+
+# Loads the full symbol to ID mapping in one query, used by bulk syncs that would otherwise look up every symbol individually
+# The cache is per process, so a currency created by another process isn't in a cached map until the TTL runs out, a cached map missing any of required_symbols is reloaded
+async def read_currency_symbol_map(
+    database: Database, required_symbols: Iterable[str] = None
+) -> Dict[str, int]:
+    symbol_map = currency_cache.get("symbol_map")
+    if symbol_map and not set(required_symbols or ()).difference(symbol_map):
+        return symbol_map
+    symbol_map = {}
+    query = currency_table.select().with_only_columns(
+        [currency_table.c.id, currency_table.c.symbol]
+    )
+    async for row in database.iterate(query):
+        symbol_map[row["symbol"]] = row["id"]
+    if not symbol_map:
+        logging.error(f"Read Currency Symbol Map : No Results")
+    else:
+        currency_cache.set("symbol_map", symbol_map)
+    return symbol_map
 
 
 async def read_all_currencies(database: Database, limit: int):
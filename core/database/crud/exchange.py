@@ -1,7 +1,9 @@
 import logging
 
 from databases import Database
-from sqlalchemy import and_
+from sqlalchemy import and_, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Dict, List
 from core.database.helpers import build_model_from_row, write_db
 from core.database.tables.exchange import get_exchange_table
 from core.models.exchange import ExchangeInModel, ExchangeModel
@@ -28,7 +30,7 @@ async def read_all_exchanges(database: Database, limit: int):
         return exchanges
     query = exchange_table.select().limit(limit)
     async for row in database.iterate(query):
-        exchanges.append(build_model_from_row(row, ExchangeModel))
+        exchanges.append(build_model_from_row(row, ExchangeModel, trusted=True))
     if not exchanges:
         logging.error(f"Read All Exchanges : No Results")
     return exchanges
@@ -40,7 +42,7 @@ async def read_all_active_exchanges(database: Database):
         exchange_table.c.status == BottifyStatus.Active.value
     )
     async for row in database.iterate(query):
-        exchanges.append(build_model_from_row(row, ExchangeModel))
+        exchanges.append(build_model_from_row(row, ExchangeModel, trusted=True))
     if not exchanges:
         logging.error(f"Read All Active Exchanges : No Results")
     return exchanges
@@ -66,7 +68,7 @@ async def read_active_exchange_by_user_exchange_type(
         .limit(1)
     )
     row = await database.fetch_one(query)
-    return build_model_from_row(row, ExchangeModel)
+    return build_model_from_row(row, ExchangeModel, trusted=True)
 
 
 async def read_exchange_by_id(database: Database, exchange_id: int):
@@ -77,14 +79,50 @@ async def read_exchange_by_id(database: Database, exchange_id: int):
         return None
     query = exchange_table.select().where(exchange_table.c.id == exchange_id).limit(1)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, ExchangeModel)
+    return build_model_from_row(row, ExchangeModel, trusted=True)
+
+
+# Loads every requested exchange in a single WHERE id = ANY(...) round trip, keyed by exchange ID
+async def read_exchanges_by_ids(
+    database: Database, exchange_ids: List[int]
+) -> Dict[int, ExchangeModel]:
+    exchanges = {}
+    if not isinstance(exchange_ids, list):
+        logging.error(
+            f"Read Exchanges by IDs : Exchange IDs Must be a List of Integers : Got {type(exchange_ids)}"
+        )
+        return exchanges
+    if not exchange_ids:
+        return exchanges
+    query = exchange_table.select().where(
+        exchange_table.c.id
+        == any_(
+            bindparam("exchange_ids", list(set(exchange_ids)), type_=ARRAY(Integer))
+        )
+    )
+    async for row in database.iterate(query):
+        exchange = build_model_from_row(row, ExchangeModel, trusted=True)
+        if exchange:
+            exchanges[exchange.id] = exchange
+    if not exchanges:
+        logging.error(f"Read Exchanges by IDs : No Results")
+    return exchanges
 
 
 def sync_read_exchange_by_id(connection, exchange_id: int):
     query = exchange_table.select().where(exchange_table.c.id == exchange_id).limit(1)
     results = connection.execute(query)
     for row in results:
-        return build_model_from_row(row, ExchangeModel)
+        return build_model_from_row(row, ExchangeModel, trusted=True)
+
+
+def read_active_exchanges_by_user_query(user_id: int):
+    return exchange_table.select().where(
+        and_(
+            exchange_table.c.user_id == user_id,
+            exchange_table.c.status == BottifyStatus.Active.value,
+        )
+    )
 
 
 async def read_active_exchanges_by_user(database: Database, user_id: int):
@@ -94,14 +132,9 @@ async def read_active_exchanges_by_user(database: Database, user_id: int):
             f"Read Exchanges by User : User ID Must be an Integer : Got {type(user_id)}"
         )
         return exchanges
-    query = exchange_table.select().where(
-        and_(
-            exchange_table.c.user_id == user_id,
-            exchange_table.c.status == BottifyStatus.Active.value,
-        )
-    )
+    query = read_active_exchanges_by_user_query(user_id)
     async for row in database.iterate(query):
-        exchanges.append(build_model_from_row(row, ExchangeModel))
+        exchanges.append(build_model_from_row(row, ExchangeModel, trusted=True))
     if not exchanges:
         logging.error(f"Read Exchanges by User : No Results : User ID {str(user_id)}")
     return exchanges
@@ -0,0 +1,63 @@
+import logging
+
+from databases import Database
+from typing import Dict
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from core.database.tables.feed_cursor import get_feed_cursor_table
+
+feed_cursor_table = get_feed_cursor_table()
+
+
+async def read_feed_cursors(database: Database, exchange_id: int) -> Dict[str, int]:
+    cursors = {}
+    if not isinstance(exchange_id, int):
+        logging.error(
+            f"Read Feed Cursors : Exchange ID Must be an Integer : Got {type(exchange_id)}"
+        )
+        return cursors
+    query = feed_cursor_table.select().where(
+        feed_cursor_table.c.exchange_id == exchange_id
+    )
+    async for row in database.iterate(query):
+        cursors[row["market_symbol"]] = row["last_id"]
+    return cursors
+
+
+# Writes every market's cursor in one statement so a refresh either checkpoints all markets or none, cursors never move backwards
+async def upsert_feed_cursors(
+    database: Database, exchange_id: int, cursors: Dict[str, int]
+):
+    if not isinstance(exchange_id, int):
+        logging.error(
+            f"Upsert Feed Cursors : Exchange ID Must be an Integer : Got {type(exchange_id)}"
+        )
+        return False
+    if not isinstance(cursors, dict):
+        logging.error(
+            f"Upsert Feed Cursors : Cursors Must be a Dictionary : Got {type(cursors)}"
+        )
+        return False
+    if not cursors:
+        return True
+    values = [
+        {
+            "exchange_id": exchange_id,
+            "market_symbol": market_symbol,
+            "last_id": cursor,
+            "updated_at": func.now(),
+        }
+        for market_symbol, cursor in cursors.items()
+    ]
+    query = insert(feed_cursor_table).values(values)
+    query = query.on_conflict_do_update(
+        constraint="feed_cursor_uc",
+        set_={
+            "last_id": func.greatest(
+                feed_cursor_table.c.last_id, query.excluded.last_id
+            ),
+            "updated_at": query.excluded.updated_at,
+        },
+    )
+    await database.execute(query)
+    return True
@@ -4,10 +4,19 @@ from core.enums.statuses import BottifyStatus
 from core.enums.feed_sources import FeedSources
 from core.models.feed import FeedInModel, FeedModel
 from databases import Database
-from sqlalchemy import and_
+from sqlalchemy import (
+    and_,
+    or_,
+    bindparam,
+    cast,
+    func,
+    literal_column,
+    select,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 import logging
-import json
-from typing import List
+from typing import List, Tuple
 from datetime import datetime, timedelta, timezone
 
 feed_table = get_feeds_table()
@@ -24,7 +33,7 @@ async def create_feed(database: Database, feed_in: FeedInModel):
 async def read_feed_by_id(database: Database, feed_id: int):
     query = feed_table.select().where(feed_table.c.id == feed_id).limit(1)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, FeedModel)
+    return build_model_from_row(row, FeedModel, trusted=True)
 
 
 async def read_feeds_by_status(database: Database, status: BottifyStatus):
@@ -36,7 +45,7 @@ async def read_feeds_by_status(database: Database, status: BottifyStatus):
         return feeds
     query = feed_table.select().where(feed_table.c.status == status.value)
     async for row in database.iterate(query):
-        feeds.append(build_model_from_row(row, FeedModel))
+        feeds.append(build_model_from_row(row, FeedModel, trusted=True))
     if not feeds:
         logging.error(f"Read Feeds by Status : No Results : Status {str(status)}")
     return feeds
@@ -46,7 +55,7 @@ async def read_all_feeds(database: Database, limit: int):
     feeds = []
     query = feed_table.select().limit(limit)
     async for row in database.iterate(query):
-        feeds.append(build_model_from_row(row, FeedModel))
+        feeds.append(build_model_from_row(row, FeedModel, trusted=True))
     if not feeds:
         logging.error(f"Read All Feeds : No Results")
     return feeds
@@ -66,7 +75,7 @@ async def read_active_feeds(database: Database, limit: int = None) -> List[FeedM
             feed_table.c.status == BottifyStatus.Active.value
         )
     async for row in database.iterate(query):
-        feeds.append(build_model_from_row(row, FeedModel))
+        feeds.append(build_model_from_row(row, FeedModel, trusted=True))
     if not feeds:
         logging.error(f"Read Active Feeds : No Results")
     return feeds
@@ -95,26 +104,42 @@ async def read_next_overdue_active_feed(database: Database):
     )
     # print(query)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, FeedModel)
+    return build_model_from_row(row, FeedModel, trusted=True)
 
 
-async def read_overdue_active_feeds(database: Database):
-    feeds = []
-    current_time = datetime.now(tz=timezone.utc)
-    query = feed_table.select().where(
+def read_overdue_active_feeds_query(current_time: datetime):
+    return feed_table.select().where(
         and_(
             feed_table.c.next_execution_at <= current_time,
             feed_table.c.status == BottifyStatus.Active.value,
         )
     )
 
+
+async def read_overdue_active_feeds(database: Database):
+    feeds = []
+    query = read_overdue_active_feeds_query(datetime.now(tz=timezone.utc))
+
     async for row in database.iterate(query):
-        feeds.append(build_model_from_row(row, FeedModel))
+        feeds.append(build_model_from_row(row, FeedModel, trusted=True))
     if not feeds:
         logging.error(f"Read Overdue Active Feeds : No Results")
     return feeds
 
 
+# Only the columns the scheduler needs, avoids building a FeedModel (and resolving its generator) for every feed on every sync
+async def read_active_feed_schedule(database: Database) -> List[Tuple[int, datetime]]:
+    schedule = []
+    query = (
+        feed_table.select()
+        .with_only_columns([feed_table.c.id, feed_table.c.next_execution_at])
+        .where(feed_table.c.status == BottifyStatus.Active.value)
+    )
+    async for row in database.iterate(query):
+        schedule.append((row["id"], row["next_execution_at"]))
+    return schedule
+
+
 async def read_active_feed_by_type(database: Database, feed_type: FeedSources):
     if not isinstance(feed_type, FeedSources):
         logging.error(
@@ -132,7 +157,7 @@ async def read_active_feed_by_type(database: Database, feed_type: FeedSources):
         .limit(1)
     )
     row = await database.fetch_one(query)
-    return build_model_from_row(row, FeedModel)
+    return build_model_from_row(row, FeedModel, trusted=True)
 
 
 async def update_feed_status(
@@ -153,82 +178,205 @@ async def update_feed_status(
     return True
 
 
-async def update_feed_refresh_started(database: Database, feed_id: int):
-    feed_to_update = await read_feed_by_id(database, feed_id)
-    if not feed_to_update:
+def claimable_feed_clause():
+    return or_(
+        feed_table.c.status == BottifyStatus.Active.value,
+        and_(
+            feed_table.c.status == BottifyStatus.Busy.value,
+            feed_table.c.lease_expires_at < func.now(),
+        ),
+    )
+
+
+# Feeds that have never run have no next_execution_at, the scheduler treats them as due
+def due_feed_clause():
+    return or_(
+        feed_table.c.next_execution_at.is_(None),
+        feed_table.c.next_execution_at <= func.now(),
+    )
+
+
+# Atomically marks up to limit due feeds Busy with a lease and returns them, SKIP LOCKED lets concurrent claimers split the work instead of blocking or double-claiming
+async def claim_overdue_feeds(
+    database: Database, limit: int, lease_seconds: int
+) -> List[FeedModel]:
+    feeds = []
+    if not isinstance(limit, int):
         logging.error(
-            f"Update Feed Refresh Started : Feed Does Not Exist : Feed ID: {str(feed_id)}"
+            f"Claim Overdue Feeds : Limit Must be an Integer : Got {type(limit)}"
         )
+        return feeds
+    claimable = (
+        select([feed_table.c.id])
+        .where(and_(due_feed_clause(), claimable_feed_clause()))
+        .order_by(feed_table.c.next_execution_at.asc().nullsfirst())
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    query = (
+        feed_table.update()
+        .where(feed_table.c.id.in_(claimable))
+        .values(
+            {
+                "status": BottifyStatus.Busy.value,
+                "lease_expires_at": func.now() + timedelta(seconds=lease_seconds),
+            }
+        )
+        .returning(*feed_table.c)
+    )
+    for row in await database.fetch_all(query):
+        feeds.append(build_model_from_row(row, FeedModel, trusted=True))
+    return feeds
+
+
+# Claims a single due feed by ID, returns None if it is inactive, not due yet or another worker holds a live lease
+# The due check stops a redispatched duplicate from refreshing again right after the first message completed the feed
+async def claim_feed(database: Database, feed_id: int, lease_seconds: int):
+    if not isinstance(feed_id, int):
+        logging.error(f"Claim Feed : Feed ID Must be an Integer : Got {type(feed_id)}")
         return None
+    query = (
+        feed_table.update()
+        .where(
+            and_(
+                feed_table.c.id == feed_id,
+                due_feed_clause(),
+                claimable_feed_clause(),
+            )
+        )
+        .values(
+            {
+                "status": BottifyStatus.Busy.value,
+                "lease_expires_at": func.now() + timedelta(seconds=lease_seconds),
+            }
+        )
+        .returning(*feed_table.c)
+    )
+    row = await database.fetch_one(query)
+    return build_model_from_row(row, FeedModel, trusted=True)
 
-    if not feed_to_update.status == BottifyStatus.Active:
-        logging.error(
-            f"Update Feed Refresh Started : Tried to Refresh an Inactive Feed : Feed ID {str(feed_id)}"
+
+# Returns Busy feeds whose lease has expired to Active so the scheduler picks them up again
+async def release_expired_feed_leases(database: Database) -> List[int]:
+    query = (
+        feed_table.update()
+        .where(
+            and_(
+                feed_table.c.status == BottifyStatus.Busy.value,
+                feed_table.c.lease_expires_at < func.now(),
+            )
         )
-        return None
+        .values({"status": BottifyStatus.Active.value, "lease_expires_at": None})
+        .returning(feed_table.c.id)
+    )
+    return [row["id"] for row in await database.fetch_all(query)]
+
+
+async def update_feed_refresh_started(database: Database, feed_id: int):
     query = (
         feed_table.update()
-        .where(feed_table.c.id == feed_id)
+        .where(
+            and_(
+                feed_table.c.id == feed_id,
+                feed_table.c.status == BottifyStatus.Active.value,
+            )
+        )
         .values({"status": BottifyStatus.Busy.value})
+        .returning(*feed_table.c)
     )
-    await database.execute(query)
+    row = await database.fetch_one(query)
+    if not row:
+        logging.error(
+            f"Update Feed Refresh Started : Feed Does Not Exist or is Inactive : Feed ID: {str(feed_id)}"
+        )
+        return None
     logging.debug(f"Update Feed Refresh Started : Success : Feed ID: {feed_id}")
-    return await read_feed_by_id(database, feed_id)
+    return build_model_from_row(row, FeedModel, trusted=True)
 
 
+# next_execution_at is computed from the row's own update_interval so the feed doesn't need to be read first
 async def update_feed_refresh_complete(
     database: Database, feed_id: int, success: bool = True
 ):
-    feed_to_update = await read_feed_by_id(database, feed_id)
-    if not feed_to_update:
+    query = (
+        feed_table.update()
+        .where(feed_table.c.id == feed_id)
+        .values(
+            {
+                "status": BottifyStatus.Active.value
+                if success
+                else BottifyStatus.Error.value,
+                "last_execution_at": func.now(),
+                "next_execution_at": func.now()
+                + feed_table.c.update_interval * literal_column("interval '1 minute'"),
+                "lease_expires_at": None,
+            }
+        )
+        .returning(feed_table.c.id)
+    )
+    row = await database.fetch_one(query)
+    if not row:
         logging.error(
             f"Update Feed Refresh Complete : No Feed to Update : Feed ID {feed_id}"
         )
         return False
-    current_time = datetime.now(tz=timezone.utc)
-    next_execution_time = current_time + timedelta(
-        minutes=feed_to_update.update_interval
-    )
-    query = (feed_table.update().where(feed_table.c.id == feed_to_update.id)).values(
-        {
-            "status": BottifyStatus.Active.value
-            if success
-            else BottifyStatus.Error.value,
-            "last_execution_at": current_time,
-            "next_execution_at": next_execution_time,
-        }
-    )
-    await database.execute(query)
     logging.info(
-        f"Update Feed Refresh Complete : Success : Feed ID {feed_to_update.id} : New Status {BottifyStatus.Active if success else BottifyStatus.Error}"
+        f"Update Feed Refresh Complete : Success : Feed ID {feed_id} : New Status {BottifyStatus.Active if success else BottifyStatus.Error}"
     )
     return True
 
 
-async def update_feed_configs(database: Database, feed_id: int, new_configs: dict):
-    if not isinstance(new_configs, dict):
+# Puts a feed whose refresh failed back on the schedule retry_seconds from now and drops its lease, Error is reserved for feeds that can't run at all
+async def update_feed_refresh_failed(
+    database: Database, feed_id: int, retry_seconds: int
+):
+    query = (
+        feed_table.update()
+        .where(feed_table.c.id == feed_id)
+        .values(
+            {
+                "status": BottifyStatus.Active.value,
+                "last_execution_at": func.now(),
+                "next_execution_at": func.now() + timedelta(seconds=retry_seconds),
+                "lease_expires_at": None,
+            }
+        )
+        .returning(feed_table.c.id)
+    )
+    row = await database.fetch_one(query)
+    if not row:
         logging.error(
-            f"Update Feed Configs : New Config Input Must be a Dict : Got {type(new_configs)} : Feed ID {feed_id}"
+            f"Update Feed Refresh Failed : No Feed to Update : Feed ID {feed_id}"
         )
         return False
-    feed = await read_feed_by_id(database, feed_id)
-    if not feed:
-        logging.error(f"Update Feed Configs : No Feed to Update : Feed ID {feed_id}")
-        return False
-    if not feed.configs:
-        feed.configs = new_configs
-    else:
-        feed.configs.update(new_configs)
-    if not feed.configs:
+    logging.warning(
+        f"Update Feed Refresh Failed : Retry Scheduled : Feed ID {feed_id} : Retry in {retry_seconds}s"
+    )
+    return True
+
+
+# Merges new_configs into the stored configs in SQL with jsonb ||, configs is stored as Text so it is cast both ways
+async def update_feed_configs(database: Database, feed_id: int, new_configs: dict):
+    if not isinstance(new_configs, dict):
         logging.error(
-            f"Update Feed Configs : Configs is None after Merging : Old Configs {feed.configs} : New Configs {new_configs}"
+            f"Update Feed Configs : New Config Input Must be a Dict : Got {type(new_configs)} : Feed ID {feed_id}"
         )
         return False
+    # FeedInModel always writes a JSON object, coalesce only covers rows stored with NULL configs
+    current_configs = cast(func.coalesce(feed_table.c.configs, "{}"), JSONB)
+    # Bound as JSONB so the dict is encoded once, casting a json.dumps string to JSONB double encodes it
+    merged_configs = current_configs.op("||")(
+        bindparam("new_configs", new_configs, type_=JSONB)
+    )
     query = (
         feed_table.update()
-        .where(feed_table.c.id == feed.id)
-        .values({"configs": json.dumps(feed.configs)})
+        .where(feed_table.c.id == feed_id)
+        .values({"configs": cast(merged_configs, Text)})
+        .returning(feed_table.c.id)
     )
-    await database.execute(query)
-    logging.info(f"Update Feed Configs : Complete : Feed ID {feed.id}")
+    row = await database.fetch_one(query)
+    if not row:
+        logging.error(f"Update Feed Configs : No Feed to Update : Feed ID {feed_id}")
+        return False
+    logging.info(f"Update Feed Configs : Complete : Feed ID {feed_id}")
     return True
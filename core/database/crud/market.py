@@ -1,7 +1,9 @@
 import logging
 
 from databases import Database
-from sqlalchemy import and_
+from sqlalchemy import and_, any_, bindparam, func, Integer
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from typing import Dict, List
 from core.database.helpers import build_model_from_row, write_db
 from core.database.tables.market import get_market_table
 from core.models.market import MarketInModel, MarketModel
@@ -29,7 +31,7 @@ async def read_all_markets(database: Database, limit: int):
         return markets
     query = market_table.select().limit(limit)
     async for row in database.iterate(query):
-        markets.append(build_model_from_row(row, MarketModel))
+        markets.append(build_model_from_row(row, MarketModel, trusted=True))
     if not markets:
         logging.error(f"Read All Markets : No Results")
     return markets
@@ -44,7 +46,7 @@ async def read_markets_by_status(database: Database, status: BottifyStatus):
         return markets
     query = market_table.select().where(market_table.c.status == status.value)
     async for row in database.iterate(query):
-        markets.append(build_model_from_row(row, MarketModel))
+        markets.append(build_model_from_row(row, MarketModel, trusted=True))
     if not markets:
         logging.debug("Read Markets by Status : No Results")
     return markets
@@ -54,6 +56,11 @@ async def read_active_markets(database: Database):
     return await read_markets_by_status(database, BottifyStatus.Active)
 
 
+# Tag filters use the array overlap operator (&&) so they run against the GIN index on market.tags
+def read_markets_by_tags_query(input_tags: list):
+    return market_table.select().where(market_table.c.tags.overlap(input_tags))
+
+
 async def read_markets_by_tags(database: Database, input_tags: list):
     markets = []
     if not isinstance(input_tags, list):
@@ -61,14 +68,9 @@ async def read_markets_by_tags(database: Database, input_tags: list):
             f"Read Markets with Tags : Tags must be a List of Strings : Got {type(input_tags)}"
         )
         return markets
-    query = market_table.select().where(market_table.c.tags != None)
+    query = read_markets_by_tags_query(input_tags)
     async for row in database.iterate(query):
-        market = build_model_from_row(row, MarketModel)
-        if not market:
-            continue
-        for tag in market.tags:
-            if tag in input_tags:
-                markets.append(build_model_from_row(row, MarketModel))
+        markets.append(build_model_from_row(row, MarketModel, trusted=True))
     if not markets:
         logging.debug("Read Markets with Tags : No Results")
     return markets
@@ -81,14 +83,9 @@ def sync_read_markets_by_tags(connection, input_tags: list):
             f"Read Markets with Tags : Tags must be a List of Strings : Got {type(input_tags)}"
         )
         return markets
-    query = market_table.select().where(market_table.c.tags != None)
+    query = read_markets_by_tags_query(input_tags)
     for row in connection.execute(query):
-        market = build_model_from_row(row, MarketModel)
-        if not market:
-            continue
-        for tag in market.tags:
-            if tag in input_tags:
-                markets.append(build_model_from_row(row, MarketModel))
+        markets.append(build_model_from_row(row, MarketModel, trusted=True))
     if not markets:
         logging.debug("Read Markets with Tags : No Results")
     return markets
@@ -104,15 +101,13 @@ async def read_markets_by_exchange_tags(
         )
         return markets
     query = market_table.select().where(
-        market_table.c.exchange_id == exchange_id, market_table.c.tags != None
+        and_(
+            market_table.c.exchange_id == exchange_id,
+            market_table.c.tags.overlap(input_tags),
+        )
     )
     async for row in database.iterate(query):
-        market = build_model_from_row(row, MarketModel)
-        if not market:
-            continue
-        for tag in market.tags:
-            if tag in input_tags:
-                markets.append(build_model_from_row(row, MarketModel))
+        markets.append(build_model_from_row(row, MarketModel, trusted=True))
     if not markets:
         logging.debug("Read Markets by Exchange Tags : No Results")
     return markets
@@ -130,7 +125,7 @@ async def read_markets_by_exchange(
 
     query = market_table.select().where(market_table.c.exchange_id == exchange_id)
     async for row in database.iterate(query):
-        markets.append(build_model_from_row(row, MarketModel))
+        markets.append(build_model_from_row(row, MarketModel, trusted=True))
     if not markets:
         logging.error(f"Read Markets by Exchange : No Results")
     return markets
@@ -144,23 +139,69 @@ async def read_market_by_id(database: Database, market_id: int):
         return None
     query = market_table.select().where(market_table.c.id == market_id).limit(1)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, MarketModel)
+    return build_model_from_row(row, MarketModel, trusted=True)
 
 
-async def read_market_by_exchange_symbol(
-    database: Database, exchange_id: int, symbol: str
-):
-    if not isinstance(exchange_id, int):
+# Loads every requested market in a single WHERE id = ANY(...) round trip, keyed by market ID
+async def read_markets_by_ids(
+    database: Database, market_ids: List[int]
+) -> Dict[int, MarketModel]:
+    markets = {}
+    if not isinstance(market_ids, list):
         logging.error(
-            f"Read Market by Exchange Symbol : Exchange ID Must be an Integer : Got {type(symbol)}"
+            f"Read Markets by IDs : Market IDs Must be a List of Integers : Got {type(market_ids)}"
         )
-        return None
+        return markets
+    if not market_ids:
+        return markets
+    query = market_table.select().where(
+        market_table.c.id
+        == any_(bindparam("market_ids", list(set(market_ids)), type_=ARRAY(Integer)))
+    )
+    async for row in database.iterate(query):
+        market = build_model_from_row(row, MarketModel, trusted=True)
+        if market:
+            markets[market.id] = market
+    if not markets:
+        logging.error(f"Read Markets by IDs : No Results")
+    return markets
+
+
+# Loads the market with a given symbol on each of the requested exchanges, keyed by exchange ID
+async def read_markets_by_exchange_ids_symbol(
+    database: Database, exchange_ids: List[int], symbol: str
+) -> Dict[int, MarketModel]:
+    markets = {}
+    if not isinstance(exchange_ids, list):
+        logging.error(
+            f"Read Markets by Exchange IDs Symbol : Exchange IDs Must be a List of Integers : Got {type(exchange_ids)}"
+        )
+        return markets
     if not isinstance(symbol, str):
         logging.error(
-            f"Read Market by Exchange Symbol : Symbol Must be a String : Got {type(symbol)}"
+            f"Read Markets by Exchange IDs Symbol : Symbol Must be a String : Got {type(symbol)}"
         )
-        return None
-    query = (
+        return markets
+    if not exchange_ids:
+        return markets
+    query = market_table.select().where(
+        and_(
+            market_table.c.exchange_id
+            == any_(bindparam("exchange_ids", exchange_ids, type_=ARRAY(Integer))),
+            market_table.c.symbol == symbol,
+        )
+    )
+    async for row in database.iterate(query):
+        market = build_model_from_row(row, MarketModel, trusted=True)
+        if market:
+            markets[market.exchange_id] = market
+    if not markets:
+        logging.debug("Read Markets by Exchange IDs Symbol : No Results")
+    return markets
+
+
+def read_market_by_exchange_symbol_query(exchange_id: int, symbol: str):
+    return (
         market_table.select()
         .where(
             and_(
@@ -170,8 +211,24 @@ async def read_market_by_exchange_symbol(
         )
         .limit(1)
     )
+
+
+async def read_market_by_exchange_symbol(
+    database: Database, exchange_id: int, symbol: str
+):
+    if not isinstance(exchange_id, int):
+        logging.error(
+            f"Read Market by Exchange Symbol : Exchange ID Must be an Integer : Got {type(symbol)}"
+        )
+        return None
+    if not isinstance(symbol, str):
+        logging.error(
+            f"Read Market by Exchange Symbol : Symbol Must be a String : Got {type(symbol)}"
+        )
+        return None
+    query = read_market_by_exchange_symbol_query(exchange_id, symbol)
     row = await database.fetch_one(query)
-    return build_model_from_row(row, MarketModel)
+    return build_model_from_row(row, MarketModel, trusted=True)
 
 
 async def update_market(database: Database, market_id: int, market_in: MarketInModel):
@@ -191,6 +248,56 @@ async def update_market(database: Database, market_id: int, market_in: MarketInM
     return True
 
 
+# Writes every market in a single INSERT ... ON CONFLICT (exchange_id, symbol) DO UPDATE, mirrors the columns update_market leaves alone
+async def upsert_markets(database: Database, markets_in: List[MarketInModel]):
+    if not isinstance(markets_in, list):
+        logging.error(
+            f"Upsert Markets : Input Must be a List of MarketInModels : Got {type(markets_in)}"
+        )
+        return False
+    if not markets_in:
+        return True
+    values = []
+    for market_in in markets_in:
+        if not isinstance(market_in, MarketInModel):
+            logging.error(
+                f"Upsert Markets : Input Must be a MarketInModel : Got {type(market_in)}"
+            )
+            return False
+        values.append(market_in.dict())
+    query = insert(market_table).values(values)
+    query = query.on_conflict_do_update(
+        index_elements=[market_table.c.exchange_id, market_table.c.symbol],
+        set_={
+            "base_currency_id": query.excluded.base_currency_id,
+            "quote_currency_id": query.excluded.quote_currency_id,
+            "status": query.excluded.status,
+            "min_trade_size": query.excluded.min_trade_size,
+            "notice": query.excluded.notice,
+            "tags": query.excluded.tags,
+            "updated_at": func.now(),
+        },
+    )
+    await database.execute(query)
+    return True
+
+
+def read_market_by_base_quote_exchange_ids_query(
+    base_currency_id: int, quote_currency_id: int, exchange_id: int
+):
+    return (
+        market_table.select()
+        .where(
+            and_(
+                market_table.c.base_currency_id == base_currency_id,
+                market_table.c.quote_currency_id == quote_currency_id,
+                market_table.c.exchange_id == exchange_id,
+            )
+        )
+        .limit(1)
+    )
+
+
 async def read_market_by_base_quote_exchange_ids(
     database: Database, base_currency_id: int, quote_currency_id: int, exchange_id: int
 ):
@@ -209,16 +316,50 @@ async def read_market_by_base_quote_exchange_ids(
             f"Read Market by Base Quote IDs : Exchange ID Must be an Integer : Got {type(exchange_id)}"
         )
         return None
-    query = (
-        market_table.select()
-        .where(
-            and_(
-                market_table.c.base_currency_id == base_currency_id,
-                market_table.c.quote_currency_id == quote_currency_id,
-                market_table.c.exchange_id == exchange_id,
-            )
-        )
-        .limit(1)
+    query = read_market_by_base_quote_exchange_ids_query(
+        base_currency_id, quote_currency_id, exchange_id
     )
     row = await database.fetch_one(query)
-    return build_model_from_row(row, MarketModel)
+    return build_model_from_row(row, MarketModel, trusted=True)
+
+
+# Loads the base/quote market on each of the requested exchanges, keyed by exchange ID
+async def read_markets_by_base_quote_exchange_ids(
+    database: Database,
+    base_currency_id: int,
+    quote_currency_id: int,
+    exchange_ids: List[int],
+) -> Dict[int, MarketModel]:
+    markets = {}
+    if not isinstance(base_currency_id, int):
+        logging.error(
+            f"Read Markets by Base Quote Exchange IDs : Base Currency ID Must be an Integer : Got {type(base_currency_id)}"
+        )
+        return markets
+    if not isinstance(quote_currency_id, int):
+        logging.error(
+            f"Read Markets by Base Quote Exchange IDs : Quote Currency ID Must be an Integer : Got {type(quote_currency_id)}"
+        )
+        return markets
+    if not isinstance(exchange_ids, list):
+        logging.error(
+            f"Read Markets by Base Quote Exchange IDs : Exchange IDs Must be a List of Integers : Got {type(exchange_ids)}"
+        )
+        return markets
+    if not exchange_ids:
+        return markets
+    query = market_table.select().where(
+        and_(
+            market_table.c.base_currency_id == base_currency_id,
+            market_table.c.quote_currency_id == quote_currency_id,
+            market_table.c.exchange_id
+            == any_(bindparam("exchange_ids", exchange_ids, type_=ARRAY(Integer))),
+        )
+    )
+    async for row in database.iterate(query):
+        market = build_model_from_row(row, MarketModel, trusted=True)
+        if market:
+            markets[market.exchange_id] = market
+    if not markets:
+        logging.debug("Read Markets by Base Quote Exchange IDs : No Results")
+    return markets
@@ -33,13 +33,17 @@ async def read_monitor_by_id(database: Database, sub_id: int):
     return build_model_from_row(row, MonitorModel)
 
 
+def read_monitor_by_source_id_query(source_id: str):
+    return monitor_table.select().where(monitor_table.c.source_id == source_id)
+
+
 async def read_monitor_by_source_id(database: Database, source_id: str):
     if not isinstance(source_id, str):
         logging.error(
             f"Read Monitor by Source ID : Source ID Must be a String : Got {type(source_id)}"
         )
         return None
-    query = monitor_table.select().where(monitor_table.c.source_id == source_id)
+    query = read_monitor_by_source_id_query(source_id)
     row = await database.fetch_one(query)
     if not row:
         logging.error(f"Read Alert Subscriptions By Source ID : No Results")
@@ -50,6 +50,10 @@ async def read_all_reactions(database: Database, limit: int):
     return reactions
 
 
+def read_reactions_by_monitor_id_query(monitor_id: int):
+    return reaction_table.select().where(reaction_table.c.monitor_id == monitor_id)
+
+
 async def read_reactions_by_monitor_id(database: Database, monitor_id: int):
     results = []
     if not isinstance(monitor_id, int):
@@ -57,7 +61,7 @@ async def read_reactions_by_monitor_id(database: Database, monitor_id: int):
             f"Read Alert Subscription by Monitor ID : Monitor ID Must be an Integer : Got {type(monitor_id)}"
         )
         return results
-    query = reaction_table.select().where(reaction_table.c.monitor_id == monitor_id)
+    query = read_reactions_by_monitor_id_query(monitor_id)
     async for row in database.iterate(query):
         results.append(build_model_from_row(row, ReactionModel))
     if not results:
@@ -70,6 +70,12 @@ async def read_subscriptions_by_monitor_id(database: Database, monitor_id: int):
     return subs
 
 
+def read_subscriptions_by_strategy_id_query(strategy_id: int):
+    return subscription_table.select().where(
+        subscription_table.c.strategy_id == strategy_id
+    )
+
+
 async def read_subscriptions_by_strategy_id(database: Database, strategy_id: int):
     subs = []
     if not isinstance(monitor_id, int):
@@ -77,9 +83,7 @@ async def read_subscriptions_by_strategy_id(database: Database, strategy_id: int
             f"Read Alert Subscription by Strategy ID : Strategy ID Must be an Integer : Got {type(strategy_id)}"
         )
         return subs
-    query = subscription_table.select().where(
-        subscription_table.c.strategy_id == strategy_id
-    )
+    query = read_subscriptions_by_strategy_id_query(strategy_id)
     async for row in database.iterate(query):
         subs.append(build_model_from_row(row_data, SubscriptionModel))
     if not subs:
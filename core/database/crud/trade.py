@@ -43,14 +43,18 @@ async def read_trade_by_id(database: Database, trade_id: int):
     return build_model_from_row(row, TradeModel)
 
 
+def read_trade_by_source_id_query(trade_source_id: str):
+    return (
+        trade_table.select().where(trade_table.c.source_id == trade_source_id).limit(1)
+    )
+
+
 async def read_trade_by_source_id(database: Database, trade_source_id: str):
     if not isinstance(trade_source_id, str):
         logging.error(
             f"Read Trade by Source ID : Trade Source ID Must be a String : Got {type(trade_source_id)}"
         )
         return None
-    query = (
-        trade_table.select().where(trade_table.c.source_id == trade_source_id).limit(1)
-    )
+    query = read_trade_by_source_id_query(trade_source_id)
     row = await database.fetch_one(query)
     return build_model_from_row(row, TradeModel)
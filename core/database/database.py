@@ -1,12 +1,20 @@
 from databases import Database
 from pydantic import BaseModel
 from sqlalchemy import create_engine
+from contextlib import asynccontextmanager
 from core.config import settings
 import os
 import logging
 
 database = Database(str(settings.MainDatabase))
 
+# Process-wide pool for Celery workers, connected on worker_process_init and shared by every task in the process
+worker_database = Database(
+    str(settings.MainDatabase),
+    min_size=settings.WorkerDatabaseMinSize,
+    max_size=settings.WorkerDatabaseMaxSize,
+)
+
 engine = create_engine(str(settings.MainDatabase))
 
 
@@ -21,5 +29,32 @@ def create_db():
     return Database(str(settings.MainDatabase), min_size=1, max_size=2)
 
 
+async def connect_worker_db():
+    if worker_database.is_connected:
+        return worker_database
+    await worker_database.connect()
+    logging.info(
+        f"Connect Worker DB : Pool Opened : Min Size {settings.WorkerDatabaseMinSize} : Max Size {settings.WorkerDatabaseMaxSize}"
+    )
+    return worker_database
+
+
+async def disconnect_worker_db():
+    if not worker_database.is_connected:
+        return
+    await worker_database.disconnect()
+    logging.info("Disconnect Worker DB : Pool Closed")
+
+
+# Used by Engine tasks, yields the shared worker pool when it's connected and falls back to a temporary connection otherwise (scripts, shells, etc.)
+@asynccontextmanager
+async def use_worker_db():
+    if worker_database.is_connected:
+        yield worker_database
+    else:
+        async with create_db() as database:
+            yield database
+
+
 def get_sync_db():
     return engine
@@ -25,6 +25,7 @@ from core.database.tables.subscription import get_subscription_table
 from core.database.tables.monitor import get_monitor_table
 from core.database.tables.reaction import get_reaction_table
 from core.database.tables.config_key import get_config_key_table
+from core.database.tables.feed_cursor import get_feed_cursor_table
 from core.database.database import get_db
 
 import logging
@@ -50,14 +51,25 @@ def create_tables():
     get_monitor_table(meta)
     get_reaction_table(meta)
     get_config_key_table(meta)
+    get_feed_cursor_table(meta)
     meta.create_all(engine)
 
 
 # Helper function to build models from database rows, handles ValidationErrors
-def build_model_from_row(row_data: dict, model: BaseModel):
+# trusted=True skips validation for rows read from our own tables, models can define from_trusted_row to do the conversions their validators would have done
+def build_model_from_row(row_data: dict, model: BaseModel, trusted: bool = False):
     if not row_data:
         logging.debug(f"Build Model from Row Data : Row Data is None")
         return None
+    if trusted:
+        try:
+            if hasattr(model, "from_trusted_row"):
+                return model.from_trusted_row(row_data)
+            return model.construct(**row_data)
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(
+                f"Build Model from Row : {model} : Trusted Construction Failed, Validating Instead : {e}"
+            )
     try:
         return model(**row_data)
     except ValidationError as ve:
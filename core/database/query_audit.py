@@ -0,0 +1,128 @@
+import argparse
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
+
+from core.database.database import get_sync_db
+from core.database.crud.budget import read_budget_by_currency_exchange_strategy_query
+from core.database.crud.market import (
+    read_market_by_exchange_symbol_query,
+    read_market_by_base_quote_exchange_ids_query,
+    read_markets_by_tags_query,
+)
+from core.database.crud.balance import read_balance_by_currency_exchange_query
+from core.database.crud.feeds import read_overdue_active_feeds_query
+from core.database.crud.trade import read_trade_by_source_id_query
+from core.database.crud.exchange import read_active_exchanges_by_user_query
+from core.database.crud.bottify_order import read_open_orders_query
+from core.database.crud.currency import read_currency_by_symbol_query
+from core.database.crud.monitor import read_monitor_by_source_id_query
+from core.database.crud.reaction import read_reactions_by_monitor_id_query
+from core.database.crud.subscription import read_subscriptions_by_strategy_id_query
+
+
+# Builds the hot crud reads with sample parameters from the same query builders the crud functions run, add an entry here when a new lookup lands on a hot path
+def get_hot_queries():
+    return {
+        "read_budget_by_currency_exchange_strategy": read_budget_by_currency_exchange_strategy_query(
+            1, 1, 1
+        ),
+        "read_market_by_exchange_symbol": read_market_by_exchange_symbol_query(
+            1, "BTC-USD"
+        ),
+        "read_market_by_base_quote_exchange_ids": read_market_by_base_quote_exchange_ids_query(
+            1, 2, 1
+        ),
+        "read_markets_by_tags": read_markets_by_tags_query(["defi"]),
+        "read_balance_by_currency_exchange": read_balance_by_currency_exchange_query(
+            1, 1
+        ),
+        "read_overdue_active_feeds": read_overdue_active_feeds_query(
+            datetime.now(tz=timezone.utc)
+        ),
+        "read_trade_by_source_id": read_trade_by_source_id_query("audit"),
+        "read_active_exchanges_by_user": read_active_exchanges_by_user_query(1),
+        "read_open_orders": read_open_orders_query(),
+        "read_currency_by_symbol": read_currency_by_symbol_query("BTC"),
+        "read_monitor_by_source_id": read_monitor_by_source_id_query("audit"),
+        "read_reactions_by_monitor_id": read_reactions_by_monitor_id_query(1),
+        "read_subscriptions_by_strategy_id": read_subscriptions_by_strategy_id_query(
+            1
+        ),
+    }
+
+
+def find_seq_scans(plan: dict):
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan.get("Relation Name"))
+    for child in plan.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+def explain_query(connection, query):
+    compiled = query.compile(dialect=postgresql.dialect())
+    result = connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, FORMAT JSON) {compiled}", compiled.params
+    )
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+# Runs EXPLAIN ANALYZE for every hot query against the configured database and reports Seq Scans, exits non-zero if any are found
+# Seq scans are disabled by default because a near empty local database makes the planner prefer them even when a usable index exists
+def audit_queries(allow_seqscan: bool = False, names: list = None):
+    engine = get_sync_db()
+    failures = {}
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            if not allow_seqscan:
+                connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+            for name, query in get_hot_queries().items():
+                if names and name not in names:
+                    continue
+                plan = explain_query(connection, query)
+                scans = find_seq_scans(plan.get("Plan", {}))
+                if scans:
+                    failures[name] = scans
+                    logging.error(
+                        f"Query Audit : Sequential Scan : Query {name} : Relations {scans}"
+                    )
+                else:
+                    logging.info(
+                        f"Query Audit : OK : Query {name} : Execution Time {plan.get('Execution Time')} ms"
+                    )
+        finally:
+            transaction.rollback()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN ANALYZE the hot crud queries and report sequential scans"
+    )
+    parser.add_argument(
+        "--allow-seqscan",
+        action="store_true",
+        help="Leave enable_seqscan on, only useful against a production sized database",
+    )
+    parser.add_argument("queries", nargs="*", help="Only audit these query names")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+    failures = audit_queries(args.allow_seqscan, args.queries)
+    if failures:
+        logging.error(
+            f"Query Audit : Failed : {len(failures)} Queries Use Sequential Scans : {sorted(failures)}"
+        )
+        sys.exit(1)
+    logging.info("Query Audit : Passed")
+
+
+if __name__ == "__main__":
+    main()
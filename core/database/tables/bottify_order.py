@@ -45,4 +45,7 @@ def get_bottify_order_table(meta=None):
         sa.Column("time_in_force", sa.Integer, nullable=False),
         sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
         sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Index(
+            "bottify_order_status_idx", "status"
+        ),  # Open order refresh reads Active / New orders every minute
     )
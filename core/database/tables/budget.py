@@ -48,5 +48,7 @@ def get_budget_table(meta=None):
         sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False),
         sa.UniqueConstraint(
             "currency_id", "exchange_id", "strategy_id", name="budget_uc"
-        ),
+        ),  # Also serves read_budget_by_currency_exchange_strategy
+        sa.Index("budget_strategy_idx", "strategy_id"),
+        sa.Index("budget_exchange_idx", "exchange_id"),
     )
@@ -17,4 +17,5 @@ def get_exchange_table(meta=None):
         sa.Column("base_url", sa.String(length=254), nullable=False),
         sa.Column("auth", sa.Text),
         sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Index("exchange_user_status_idx", "user_id", "status"),
     )
@@ -0,0 +1,20 @@
+import sqlalchemy as sa
+
+
+def get_feed_cursor_table(meta=None):
+    if not meta:
+        meta = (
+            sa.MetaData()
+        )  # Must pass in metadata when creating tables, but we don't need it for running queries
+    return sa.Table(
+        "feed_cursor",
+        meta,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("exchange_id", sa.ForeignKey("exchange.id"), nullable=False),
+        sa.Column("market_symbol", sa.String(length=50), nullable=False),
+        sa.Column(
+            "last_id", sa.BigInteger, nullable=False
+        ),  # Last ingested exchange pagination ID, i.e. Coinbase trade_id
+        sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.UniqueConstraint("exchange_id", "market_symbol", name="feed_cursor_uc"),
+    )
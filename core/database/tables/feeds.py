@@ -19,4 +19,10 @@ def get_feeds_table(meta=None):
         sa.Column("last_execution_at", sa.TIMESTAMP(timezone=True)),
         sa.Column("next_execution_at", sa.TIMESTAMP(timezone=True)),
         sa.Column("configs", sa.Text),
+        sa.Column(
+            "lease_expires_at", sa.TIMESTAMP(timezone=True)
+        ),  # Set while a worker holds the feed Busy, an expired lease can be claimed again
+        sa.Index(
+            "feed_status_next_execution_idx", "status", "next_execution_at"
+        ),  # Overdue feed reads, claims and the scheduler's schedule read
     )
@@ -1,4 +1,5 @@
 import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
 from core.config import settings
 
 
@@ -29,5 +30,15 @@ def get_market_table(meta=None):
         sa.Column("notice", sa.String(length=200)),
         sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
         sa.Column("updated_at", sa.TIMESTAMP(timezone=True), nullable=False),
-        sa.Column("tags", sa.Text),
+        sa.Column("tags", ARRAY(sa.String)),
+        sa.UniqueConstraint("exchange_id", "symbol", name="market_uc"),
+        sa.Index(
+            "market_tags_idx", "tags", postgresql_using="gin"
+        ),  # Backs the tags overlap (&&) filters in crud/market.py
+        sa.Index(
+            "market_base_quote_exchange_idx",
+            "base_currency_id",
+            "quote_currency_id",
+            "exchange_id",
+        ),  # Alert reactions resolve markets by base / quote pair
     )
@@ -16,4 +16,5 @@ def get_reaction_table(meta=None):
         sa.Column("time_in_force", sa.Integer, nullable=False),
         sa.Column("status", sa.Integer, nullable=False),
         sa.Column("created_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Index("reaction_monitor_idx", "monitor_id"),
     )
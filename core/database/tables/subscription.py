@@ -16,5 +16,6 @@ def get_subscription_table(meta=None):
         sa.Column("created_at", sa.TIMESTAMP(timezone=True)),
         sa.UniqueConstraint(
             "monitor_id", "strategy_id", "reaction_id", name="subscription_uc"
-        ),
+        ),  # Also serves monitor_id lookups, strategy_id needs its own index
+        sa.Index("subscription_strategy_idx", "strategy_id"),
     )
@@ -6,17 +6,26 @@ from elasticsearch import (
     RequestsHttpConnection,
     TransportError,
 )
-from elasticsearch.helpers import streaming_bulk
 import json
 from typing import Dict
 import logging
 from core.config import settings
+from core.elasticsearch.bulk import BulkIndexer
+from core.elasticsearch.serializers import OrjsonSerializer
+from core.elasticsearch.ism import (
+    build_ism_policy,
+    build_index_template,
+    get_ism_policy_id,
+    get_index_pattern,
+    get_first_index_name,
+)
+from core.models.index_rollover import IndexRolloverModel
 from core.elasticsearch.transformers import transform_monitor
 from core.elasticsearch.utils import get_aws_auth
 
 # Can't use this lib's async client until we move off AWS OpenSearch :/ Upgrading will throw UnsupportedDistributionError if we move any higher than 7.1.3
 class ElasticApiHelper:
-    def __init__(self):
+    def __init__(self, serializer=None):
         self.logger = logging.getLogger("Bottify.ElasticApi")
         self.host = settings.ElasticHost.host
         self.base_url = str(settings.ElasticHost)
@@ -31,6 +40,7 @@ class ElasticApiHelper:
         self.session = Session()
         self.client = None
         self.index_base_settings = {"number_of_shards": 1}
+        self.serializer = serializer or OrjsonSerializer()
 
         aws_auth = get_aws_auth(
             self.aws_access_key, self.aws_secret_key, self.aws_service
@@ -42,6 +52,7 @@ class ElasticApiHelper:
                 use_ssl=self.use_ssl,
                 verify_certs=self.verify_certs,
                 connection_class=self.conn_cls,
+                serializer=self.serializer,
             )
         else:
             self.logger.error("AWS Authentication Not Provided")
@@ -129,6 +140,92 @@ class ElasticApiHelper:
             )
             return False
 
+    # Creates or updates the policy, ISM rejects a PUT over an existing policy unless it carries the current seq_no and primary_term
+    def put_ism_policy(self, policy_id: str, policy: dict):
+        endpoint = f"/_opendistro/_ism/policies/{policy_id}"
+        params = {}
+        try:
+            current = self.client.transport.perform_request("GET", endpoint)
+            params = {
+                "if_seq_no": current.get("_seq_no"),
+                "if_primary_term": current.get("_primary_term"),
+            }
+        except TransportError as te:
+            if te.status_code != 404:
+                self.logger.error(
+                    f"Put ISM Policy : Failed to Read Existing Policy : Policy ID {policy_id} : Data {te.info}"
+                )
+                return False
+        try:
+            self.client.transport.perform_request(
+                "PUT", endpoint, params=params, body=policy
+            )
+            return True
+        except TransportError as te:
+            self.logger.error(
+                f"Put ISM Policy : Failed to Put Policy : Policy ID {policy_id} : Data {te.info}"
+            )
+            return False
+
+    def put_index_template(self, template_name: str, template: dict):
+        try:
+            self.client.indices.put_template(name=template_name, body=template)
+            return True
+        except TransportError as te:
+            self.logger.error(
+                f"Put Index Template : Failed to Put Template : Template Name {template_name} : Data {te.info}"
+            )
+            return False
+
+    # The feed's index_name becomes a write alias over date stamped backing indices that ISM rolls over, configure before the first write
+    def create_rollover_index(
+        self, alias: str, mappings: dict, rollover: IndexRolloverModel
+    ):
+        if not self.client:
+            self.logger.error("Create Rollover Index : ElasticSearch Client is Not Ready")
+            return False
+        # The pattern must only ever match this alias's backing indices, the policy force merges and deletes whatever it matches
+        try:
+            matched = self.client.indices.get_alias(index=get_index_pattern(alias))
+        except TransportError as te:
+            self.logger.error(
+                f"Create Rollover Index : Failed to Check Backing Index Pattern : Alias {alias} : Data {te.info}"
+            )
+            return False
+        foreign = [
+            index_name
+            for index_name, data in matched.items()
+            if alias not in data.get("aliases", {})
+        ]
+        if foreign:
+            self.logger.error(
+                f"Create Rollover Index : Pattern Matches Indices Outside the Alias : Alias {alias} : Indices {foreign}"
+            )
+            return False
+        policy_id = get_ism_policy_id(alias)
+        if not self.put_ism_policy(policy_id, build_ism_policy(alias, rollover)):
+            return False
+        if not self.put_index_template(
+            policy_id, build_index_template(alias, mappings, rollover)
+        ):
+            return False
+        try:
+            if self.client.indices.exists_alias(name=alias):
+                self.logger.info(
+                    f"Create Rollover Index : Write Alias Already Exists : Alias {alias}"
+                )
+                return True
+            self.client.indices.create(
+                index=get_first_index_name(alias, rollover),
+                body={"aliases": {alias: {"is_write_index": True}}},
+            )
+            return True
+        except TransportError as te:
+            self.logger.error(
+                f"Create Rollover Index : Failed to Create First Backing Index : Alias {alias} : Data {te.info}"
+            )
+            return False
+
     def get_index_mappings(self, index_name: str):
         endpoint = f"{index_name}/_mapping"
         response = self.make_request(method="GET", endpoint=endpoint)
@@ -137,25 +234,14 @@ class ElasticApiHelper:
         self.logger.error(f"Get Index Mappings : No Results : Index Name {index_name}")
         return None
 
-    def index_generator(self, index_name, result_generator):
+    # Returns True only if every document was indexed, callers use it to decide whether to checkpoint the feed
+    # bulk_options override the ElasticBulk* settings (chunk_size, max_chunk_bytes, thread_count, ...)
+    def index_generator(self, index_name, result_generator, **bulk_options):
         if not self.client:
             self.logger.error("Index Generator : ElasticSearch Client is Not Ready")
-            return
-        for ok, action in streaming_bulk(
-            client=self.client,
-            index=index_name,
-            actions=result_generator,
-            raise_on_exception=False,  # Don’t propagate exceptions from call to bulk and just report the items that failed as failed
-            raise_on_error=False,  # Don't raise BulkIndexError containing errors (as .errors) from the execution of the last chunk when some occur.
-            max_retries=self.max_retries,  # maximum number of times a document will be retried when 429 is received
-            initial_backoff=2,
-            max_backoff=600,
-            request_timeout=60,
-        ):
-            self.logger.debug(
-                f"Index Generator : Document Indexed Successfully : Result {ok} : Action {action}"
-            )
-        return
+            return False
+        indexer = BulkIndexer(self.client, index_name, **bulk_options)
+        return indexer.index(result_generator)
 
     def index_one(self, index_name: str, doc_id: str, data: str):
         # if not isinstance(data, str):
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from elasticsearch import TransportError
+from elasticsearch.helpers import expand_action
+from core.config import settings
+from core.elasticsearch.serializers import PreSerializedDoc, dumps_bytes
+
+BulkOpTypes = ("index", "create")
+
+
+# Sends bulk requests from a bounded thread pool so several chunks are in flight at once, the async client isn't an option on AWS OpenSearch (see ElasticApiHelper)
+# Only thread_count chunks are built ahead of the cluster, a 429 pauses every sender for the backoff so a busy cluster slows the result generator down instead of queueing unbounded work
+class BulkIndexer:
+    def __init__(
+        self,
+        client,
+        index_name: str,
+        chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        thread_count: int = None,
+        max_retries: int = None,
+        initial_backoff: float = None,
+        max_backoff: float = None,
+        request_timeout: int = 60,
+        op_type: str = None,
+    ):
+        self.logger = logging.getLogger("Bottify.BulkIndexer")
+        self.client = client
+        self.index_name = index_name
+        self.chunk_size = chunk_size or settings.ElasticBulkChunkSize
+        self.max_chunk_bytes = max_chunk_bytes or settings.ElasticBulkMaxChunkBytes
+        self.thread_count = thread_count or settings.ElasticBulkThreadCount
+        self.max_retries = (
+            settings.ElasticBulkMaxRetries if max_retries is None else max_retries
+        )
+        self.initial_backoff = initial_backoff or settings.ElasticBulkInitialBackoff
+        self.max_backoff = max_backoff or settings.ElasticBulkMaxBackoff
+        self.request_timeout = request_timeout
+        self.op_type = op_type or settings.ElasticBulkOpType
+        self.lock = threading.Lock()
+        self.throttled_until = 0.0
+        self.counters = {
+            "docs_indexed": 0,
+            "docs_skipped": 0,
+            "docs_failed": 0,
+            "chunks_succeeded": 0,
+            "chunks_failed": 0,
+            "throttled": 0,
+        }
+
+    @property
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def count(self, **increments):
+        with self.lock:
+            for key, value in increments.items():
+                self.counters[key] += value
+
+    # Every sender waits out the most recent 429 before its next request
+    def throttle(self, attempt: int):
+        backoff = min(self.max_backoff, self.initial_backoff * 2 ** attempt)
+        with self.lock:
+            self.counters["throttled"] += 1
+            self.throttled_until = max(
+                self.throttled_until, time.monotonic() + backoff
+            )
+
+    def wait_for_throttle(self):
+        with self.lock:
+            delay = self.throttled_until - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+    # Generators may yield action dicts, or PreSerializedDoc / raw JSON bytes that go into the body without another encode
+    # Anything that doesn't name its own op type gets the indexer's
+    def action_lines(self, action):
+        if isinstance(action, (bytes, str)):
+            action = PreSerializedDoc(action)
+        if isinstance(action, PreSerializedDoc):
+            meta = {"_id": action.id} if action.id else {}
+            op = {action.op_type or self.op_type: meta}
+            return [dumps_bytes(op), dumps_bytes(action.source)]
+        if "_op_type" not in action:
+            action = dict(action, _op_type=self.op_type)
+        op, data = expand_action(action)
+        if data is None:
+            return [dumps_bytes(op)]
+        return [dumps_bytes(op), dumps_bytes(data)]
+
+    # Groups serialized actions into bulk bodies capped by document count and size
+    def chunk_actions(self, actions):
+        chunk, chunk_bytes = [], 0
+        for action in actions:
+            lines = self.action_lines(action)
+            size = sum(len(line) + 1 for line in lines)
+            if chunk and (
+                len(chunk) >= self.chunk_size
+                or chunk_bytes + size > self.max_chunk_bytes
+            ):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+            chunk.append(lines)
+            chunk_bytes += size
+        if chunk:
+            yield chunk
+
+    # Returns the number of documents that failed, documents rejected with 429 are resent on their own until max_retries runs out
+    def send_chunk(self, chunk: list):
+        failed = 0
+        for attempt in range(self.max_retries + 1):
+            self.wait_for_throttle()
+            body = b"\n".join(line for lines in chunk for line in lines) + b"\n"
+            try:
+                response = self.client.bulk(
+                    body=body,
+                    index=self.index_name,
+                    request_timeout=self.request_timeout,
+                )
+            except TransportError as te:
+                if te.status_code == 429 and attempt < self.max_retries:
+                    self.throttle(attempt)
+                    continue
+                self.logger.error(
+                    f"Bulk Indexer : Bulk Request Failed : Index Name {self.index_name} : Documents {len(chunk)} : Status {te.status_code} : Error {te.error}"
+                )
+                return failed + len(chunk)
+            retry, rejected, skipped = [], 0, 0
+            for lines, item in zip(chunk, response.get("items", [])):
+                op_type, result = next(iter(item.items()))
+                status = result.get("status", 500)
+                if 200 <= status < 300:
+                    continue
+                if status == 409 and op_type == "create":
+                    skipped += 1  # Already indexed under this _id
+                    continue
+                if status == 429 and attempt < self.max_retries:
+                    retry.append(lines)
+                    continue
+                rejected += 1
+                self.logger.error(
+                    f"Bulk Indexer : Document Failed to Index : Index Name {self.index_name} : Status {status} : Error {result.get('error')}"
+                )
+            failed += rejected
+            self.count(
+                docs_indexed=len(chunk) - len(retry) - rejected - skipped,
+                docs_skipped=skipped,
+            )
+            if not retry:
+                return failed
+            self.throttle(attempt)
+            chunk = retry
+        return failed + len(chunk)
+
+    def run_chunk(self, chunk: list):
+        failed = self.send_chunk(chunk)
+        if failed:
+            self.count(docs_failed=failed, chunks_failed=1)
+        else:
+            self.count(chunks_succeeded=1)
+        return failed
+
+    # Returns True only if every document was indexed
+    def index(self, actions):
+        chunks = self.chunk_actions(actions)
+        failed = 0
+        with ThreadPoolExecutor(
+            max_workers=self.thread_count, thread_name_prefix="BottifyBulkIndex"
+        ) as executor:
+            pending = set()
+            try:
+                while True:
+                    while len(pending) < self.thread_count:
+                        chunk = next(chunks, None)
+                        if chunk is None:
+                            break
+                        pending.add(executor.submit(self.run_chunk, chunk))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        failed += future.result()
+            finally:
+                for future in pending:
+                    future.cancel()
+        self.logger.info(
+            f"Bulk Indexer : Finished : Index Name {self.index_name} : Stats {self.stats}"
+        )
+        return failed == 0
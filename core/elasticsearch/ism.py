@@ -0,0 +1,84 @@
+from core.models.index_rollover import IndexRolloverModel, rollover_date_formats
+
+# Searches keep using the feed's index_name, it becomes an alias over every backing index and the write alias for the newest one
+
+
+def get_ism_policy_id(alias: str):
+    return f"{alias}-rollover"
+
+
+# Backing indices live under their own "-rollover-" namespace so the template and ISM policy of feed "trades" can't match a plain feed index like "trades-tickers"
+def get_backing_index_prefix(alias: str):
+    return f"{alias}-rollover-"
+
+
+def get_index_pattern(alias: str):
+    return f"{get_backing_index_prefix(alias)}*"
+
+
+# Date math in the name makes every rollover stamp its new index with the current day or month, e.g. trades-rollover-2021.06.01-000001
+def get_first_index_name(alias: str, rollover: IndexRolloverModel):
+    rounding, date_format, _ = rollover_date_formats[rollover.period]
+    prefix = get_backing_index_prefix(alias)
+    return f"<{prefix}{{now/{rounding}{{{date_format}}}}}-000001>"
+
+
+# hot rolls the write index over, warm force merges indices that stopped taking writes, delete drops them after retention
+def build_ism_policy(alias: str, rollover: IndexRolloverModel):
+    conditions = {"min_index_age": rollover.rollover_age}
+    if rollover.max_size:
+        conditions["min_size"] = rollover.max_size
+    if rollover.max_docs:
+        conditions["min_doc_count"] = rollover.max_docs
+    states = [{"name": "hot", "actions": [{"rollover": conditions}], "transitions": []}]
+    if rollover.force_merge_after:
+        states.append(
+            {
+                "name": "warm",
+                "actions": [
+                    {"read_only": {}},
+                    {"force_merge": {"max_num_segments": 1}},
+                ],
+                "transitions": [],
+            }
+        )
+    if rollover.retention:
+        states.append(
+            {"name": "delete", "actions": [{"delete": {}}], "transitions": []}
+        )
+    # Each state moves on to the next one once the index is old enough
+    for state, next_state in zip(states, states[1:]):
+        min_age = (
+            rollover.force_merge_after
+            if next_state["name"] == "warm"
+            else rollover.retention
+        )
+        state["transitions"].append(
+            {
+                "state_name": next_state["name"],
+                "conditions": {"min_index_age": min_age},
+            }
+        )
+    return {
+        "policy": {
+            "description": f"Bottify Rollover Policy : Alias {alias} : Period {rollover.period.value}",
+            "default_state": "hot",
+            "states": states,
+            "ism_template": {
+                "index_patterns": [get_index_pattern(alias)],
+                "priority": 100,
+            },
+        }
+    }
+
+
+def build_index_template(alias: str, mappings: dict, rollover: IndexRolloverModel):
+    template = {
+        "index_patterns": [get_index_pattern(alias)],
+        "settings": {
+            "number_of_shards": rollover.number_of_shards,
+            "opendistro.index_state_management.rollover_alias": alias,
+        },
+    }
+    template.update(mappings)
+    return template
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import NamedTuple, Union
+import orjson
+from elasticsearch.serializer import JSONSerializer
+from elasticsearch.exceptions import SerializationError
+from pydantic import BaseModel
+
+OrjsonOptions = orjson.OPT_NON_STR_KEYS
+
+
+# Decimals go out as numbers, same as pydantic's .json(), index mappings store them as doubles
+def orjson_default(obj):
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.dict(by_alias=True)
+    if isinstance(obj, timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj)}")
+
+
+def dumps_bytes(data):
+    if isinstance(data, bytes):
+        return data
+    if isinstance(data, str):
+        return data.encode("utf-8")
+    try:
+        return orjson.dumps(data, default=orjson_default, option=OrjsonOptions)
+    except TypeError as te:
+        raise SerializationError(data, te)
+
+
+# Drop in for elasticsearch-py's JSONSerializer, datetimes, UUIDs and enums are handled natively by orjson
+class OrjsonSerializer(JSONSerializer):
+    def loads(self, s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as jde:
+            raise SerializationError(s, jde)
+
+    # Strings and bytes are passed through like JSONSerializer does, BulkIndexer's bodies are already encoded
+    def dumps(self, data):
+        if isinstance(data, (str, bytes)):
+            return data
+        return dumps_bytes(data).decode("utf-8")
+
+
+# A document whose source is already JSON, BulkIndexer writes it into the bulk body as is, op_type None uses the indexer's
+class PreSerializedDoc(NamedTuple):
+    source: Union[bytes, str]
+    id: str = None
+    op_type: str = None
@@ -1,8 +1,9 @@
+import asyncio
 import logging
 from pydantic import ValidationError
 from databases import Database
 from decimal import Decimal
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.database.crud.alert import read_alert_by_id
 from core.database.crud.subscription import read_subscriptions_by_monitor_id
 from core.database.crud.strategy import read_strategy_by_id
@@ -11,8 +12,8 @@ from core.database.crud.exchange import (
     read_active_exchange_by_user_exchange_type,
 )
 from core.database.crud.market import (
-    read_market_by_exchange_symbol,
-    read_market_by_base_quote_exchange_ids,
+    read_markets_by_exchange_ids_symbol,
+    read_markets_by_base_quote_exchange_ids,
 )
 from core.database.crud.reaction import read_reaction_by_id
 from core.database.crud.currency import read_currency_by_symbol, read_currency_by_id
@@ -28,6 +29,68 @@ from core.enums.orders import OrderDirection, OrderTimeInForce, OrderType
 from core.enums.alert_type import AlertType
 
 
+# Budget lookup and ticker price for one exchange, returns the order ready to place or None if this exchange should be skipped
+async def prepare_reaction_order(
+    database: Database,
+    reaction: ReactionModel,
+    strategy: StrategyModel,
+    base_currency_id: int,
+    alert: AlertInModel,
+    order_type: OrderType,
+    exchange,
+    market,
+):
+    if not market:
+        logging.warning(
+            f"Handle Reaction : No Exchange Market Found for Alert : Market Symbol {str(alert.market)} : Currency {str(alert.currency)} : Exchange {exchange.name}"
+        )
+        return None
+    if reaction.direction == OrderDirection.Buy:
+        # We're spending our base currency
+        budget = await read_budget_by_currency_exchange_strategy(
+            database, base_currency_id, market.exchange_id, strategy.id
+        )  # TODO Pretty sure we have a problem if we need to sell ETH (it is never a quote currency for any exchange markets)
+    else:
+        # We need to spend the market's base currency, which is the alert currency when the alert didn't name a market
+        budget = await read_budget_by_currency_exchange_strategy(
+            database, market.base_currency_id, market.exchange_id, strategy.id
+        )
+    if not budget:
+        logging.error(
+            f"Handle Reaction : No Budget Found for Market : Direction {reaction.direction} : Market {market.symbol} : Exchange {market.exchange_id} : Strategy {strategy.id}"
+        )
+        return None
+
+    try:
+        new_order = BottifyOrderCreateModel(
+            strategy_id=strategy.id,
+            market_id=market.id,
+            direction=reaction.direction,
+            order_type=order_type,
+            time_in_force=reaction.time_in_force,
+        )
+        if alert.price:
+            order_price = alert.price
+            new_order.price = alert.price  # Set New Order's Price for limit orders
+        else:
+            ticker = await exchange.api(exchange).async_get_ticker(market.symbol)
+            if not ticker:
+                logging.error(
+                    f"Handle Reaction : Get Ticker Failed to Retrieve Market Price"
+                )
+                return None
+            order_price = (
+                ticker.price
+            )  # Don't assign New Order's Price for Market orders, but get the unit price for use in quantity calculation
+        new_order.quantity = budget.available * Decimal((reaction.amount / 100))
+    except ValidationError as ve:
+        logging.error(
+            f"Handle Reaction : BottifyOrderCreateModel : ValidationError : {ve.json()}"
+        )
+        return None
+    return new_order, market, exchange
+
+
 # ASKTAN
 async def async_work_handle_reaction(
     reaction_id: int, strategy_id: int, alert: AlertInModel
@@ -39,8 +102,7 @@ async def async_work_handle_reaction(
         )
         return
     exchanges = []
-    markets = []
-    async with create_db() as database:
+    async with use_worker_db() as database:
         reaction = await read_reaction_by_id(database, reaction_id)
         if not reaction:
             logging.error(
@@ -79,96 +141,59 @@ async def async_work_handle_reaction(
             exchanges.extend(
                 await read_active_exchanges_by_user(database, strategy.user_id)
             )
-        for exchange in exchanges:
-            direction = reaction.direction
-            market = None
-            if alert.market:
-                market = await read_market_by_exchange_symbol(
-                    database, exchange.id, alert.market
-                )
-                if not market:
-                    logging.error(
-                        f"Handle Reaction : No Exchange Market Found for Alert Market : Market Symbol {str(alert.market)} : Exchange ID {exchange.id}"
-                    )
-                    continue
-                else:
-                    markets.append(alert_market)
-            elif alert.currency:
-                alert_currency = await read_currency_by_symbol(database, alert.currency)
-                if not alert_currency:
-                    logging.error(
-                        f"Handle Reaction : Alert Currency Param is Invalid : Requires CurrencySymbol String : Got {str(alert.currency)}"
-                    )
-                    return
-                if alert_currency.id == strategy.base_currency_id:
-                    logging.error(
-                        f"Handle Reaction : Alert Currency is Equal to Strategy Base Currency : Alert Currency {alert_currency.symbol} : Base Currency {strategy.base_currency_id}"
-                    )
-                    return
-                market = await read_market_by_base_quote_exchange_ids(
-                    database, alert_currency.id, base_currency.id, exchange.id
-                )
-                if not market:
-                    logging.warning(
-                        f"Handle Reaction : No Exchange Market Found for Alert Currency : Base Currency {base_currency.symbol} : Alert Currency {alert_currency.symbol} : Exchange {exchange.name}"
-                    )
-                    continue
-                else:
-                    markets.append(market)
-            else:
+        exchange_ids = [exchange.id for exchange in exchanges]
+        if alert.market:
+            exchange_markets = await read_markets_by_exchange_ids_symbol(
+                database, exchange_ids, alert.market
+            )
+        elif alert.currency:
+            alert_currency = await read_currency_by_symbol(database, alert.currency)
+            if not alert_currency:
                 logging.error(
-                    f"Handle Reaction : Either Market or Currency is Required, Found Neither"
+                    f"Handle Reaction : Alert Currency Param is Invalid : Requires CurrencySymbol String : Got {str(alert.currency)}"
                 )
                 return
-            budget = None
-            if reaction.direction == OrderDirection.Buy:
-                # We're spending our base currency
-                budget = await read_budget_by_currency_exchange_strategy(
-                    database, base_currency.id, market.exchange_id, strategy.id
-                )  # TODO Pretty sure we have a problem if we need to sell ETH (it is never a quote currency for any exchange markets)
-            elif reaction.direction == OrderDirection.Sell:
-                # We need to spend the quote curreny
-                budget = await read_budget_by_currency_exchange_strategy(
-                    database, alert_currency.id, market.exchange_id, strategy.id
-                )
-            else:
+            if alert_currency.id == strategy.base_currency_id:
                 logging.error(
-                    f"Handle Reaction : Unsupported Order Direction : {str(reaction.direction)}"
+                    f"Handle Reaction : Alert Currency is Equal to Strategy Base Currency : Alert Currency {alert_currency.symbol} : Base Currency {strategy.base_currency_id}"
                 )
                 return
-            if not budget:
-                logging.error(
-                    f"Handle Reaction : No Budget Found for Market : Direction {reaction.direction} : Market {market.symbol} : Exchange {market.exchange_id} : Strategy {strategy.id}"
-                )
-                continue
-
-            try:
-                new_order = BottifyOrderCreateModel(
-                    strategy_id=strategy.id,
-                    market_id=market.id,
-                    direction=reaction.direction,
-                    order_type=order_type,
-                    time_in_force=reaction.time_in_force,
-                )
-                if alert.price:
-                    order_price = alert.price
-                    new_order.price = (
-                        alert.price
-                    )  # Set New Order's Price for limit orders
-                else:
-                    ticker = exchange.api(exchange).get_ticker(market.symbol)
-                    if not ticker:
-                        logging.error(
-                            f"Handle Reaction : Get Ticker Failed to Retrieve Market Price"
-                        )
-                        continue
-                    order_price = (
-                        ticker.price
-                    )  # Don't assign New Order's Price for Market orders, but get the unit price for use in quantity calculation
-                new_order.quantity = budget.available * Decimal((reaction.amount / 100))
-            except ValidationError as ve:
-                logging.error(
-                    f"Handle Reaction : BottifyOrderCreateModel : ValidationError : {ve.json()}"
+            exchange_markets = await read_markets_by_base_quote_exchange_ids(
+                database, alert_currency.id, base_currency.id, exchange_ids
+            )
+        else:
+            logging.error(
+                f"Handle Reaction : Either Market or Currency is Required, Found Neither"
+            )
+            return
+        if reaction.direction not in (OrderDirection.Buy, OrderDirection.Sell):
+            logging.error(
+                f"Handle Reaction : Unsupported Order Direction : {str(reaction.direction)}"
+            )
+            return
+        # Orders for every exchange are prepared and placed concurrently, latency is bounded by the slowest exchange
+        prepared_orders = await asyncio.gather(
+            *[
+                prepare_reaction_order(
+                    database,
+                    reaction,
+                    strategy,
+                    base_currency.id,
+                    alert,
+                    order_type,
+                    exchange,
+                    exchange_markets.get(exchange.id),
                 )
-                continue
-            await async_work_place_order(new_order)
+                for exchange in exchanges
+            ]
+        )
+        results = await asyncio.gather(
+            *[
+                async_work_place_order(new_order, market=market, exchange=exchange)
+                for new_order, market, exchange in filter(None, prepared_orders)
+            ],
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logging.error(f"Handle Reaction : Place Order Failed : Error {result}")
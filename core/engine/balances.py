@@ -1,67 +1,73 @@
+import asyncio
 import logging
 from pydantic import ValidationError
 
 
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.database.crud.exchange import (
     read_exchange_by_id,
     read_active_exchanges_by_user,
 )
-from core.database.crud.balance import (
-    read_balance_by_currency_exchange,
-    update_balance,
-    create_balance,
-)
-from core.database.crud.currency import read_currency_by_symbol
+from core.database.crud.balance import upsert_balances
+from core.database.crud.currency import read_currency_symbol_map
 from core.exchanges.helpers import transform_exchange_balance
 from core.models.balance import CurrencyBalanceInModel
 
 
-async def async_work_update_exchange_balances(exchange_id: int):
-    async with create_db() as database:
+async def async_work_update_exchange_balances(
+    exchange_id: int, currency_ids: dict = None
+):
+    async with use_worker_db() as database:
         exchange = await read_exchange_by_id(database, exchange_id)
         if not exchange:
             logging.error(
                 f"Update Exchange Balances : Exchange is None : Exchange ID {str(exchange_id)}"
             )
             return False
-        exchange_balances = exchange.api(exchange).get_balances()
+        exchange_balances = await exchange.api(exchange).async_get_balances()
+        symbols = {exchange_balance.symbol for exchange_balance in exchange_balances}
+        if currency_ids is None or symbols.difference(currency_ids):
+            currency_ids = await read_currency_symbol_map(database, symbols)
+        new_balances = []
         for exchange_balance in exchange_balances:
-            currency = await read_currency_by_symbol(
-                database,
-                exchange_balance.symbol,  # This assumes all possible exchange_balance objects use an alias to ensure symbol is a common field
+            currency_id = currency_ids.get(
+                exchange_balance.symbol  # This assumes all possible exchange_balance objects use an alias to ensure symbol is a common field
             )
-            if not currency:
+            if not currency_id:
                 logging.error(
                     f"Update Exchange Balances : No Currency Row for Symbol : Symbol {str(exchange_balance.symbol)} "
                 )
                 continue
             new_balance = transform_exchange_balance(
-                exchange_balance, exchange.id, exchange.exchange_type, currency.id
+                exchange_balance, exchange.id, exchange.exchange_type, currency_id
             )
             if not new_balance:
                 logging.error(f"Update Exchange Balances : Failed to Transform Balance")
                 continue
-            db_balance = await read_balance_by_currency_exchange(
-                database,
-                currency.id,
-                exchange.id,
+            new_balances.append(new_balance)
+        success = await upsert_balances(database, new_balances)
+        if not success:
+            logging.error(
+                f"Update Exchange Balances : Failed to Upsert Balances : Exchange ID {exchange.id}"
             )
-            if not db_balance:
-                logging.info(
-                    f"Update Exchange Balances : No Balance Row for Exchange Balance : Creating"
-                )
-                success = await create_balance(database, new_balance)
-                if not success:
-                    logging.error(
-                        f"Update Exchange Balances : Failed to Create New Balance"
-                    )
-            else:
-                await update_balance(database, db_balance.id, new_balance)
+            return False
+        return True
 
 
 async def async_work_update_user_balances(user_id: int):
-    async with create_db() as database:
+    async with use_worker_db() as database:
+        currency_ids = await read_currency_symbol_map(database)
         exchanges = await read_active_exchanges_by_user(database, user_id)
-        for exchange in exchanges:
-            await async_work_update_exchange_balances(exchange.id)
+    # Exchanges are refreshed concurrently so a user waits on the slowest exchange rather than the sum of them
+    results = await asyncio.gather(
+        *[
+            async_work_update_exchange_balances(exchange.id, currency_ids)
+            for exchange in exchanges
+        ],
+        return_exceptions=True,
+    )
+    for exchange, result in zip(exchanges, results):
+        if isinstance(result, Exception):
+            logging.error(
+                f"Update User Balances : Exchange Refresh Failed : Exchange ID {exchange.id} : Error {result}"
+            )
@@ -1,56 +1,125 @@
+import asyncio
 import logging
+from functools import partial
 from datetime import datetime, timezone, timedelta
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.models.feed import FeedModel
 from core.enums.feed_types import FeedTypes
 from core.enums.statuses import BottifyStatus
 from core.enums.config_key import ConfigKey
+from core.config import settings
 from core.database.crud.feeds import (
     update_feed_refresh_started,
     update_feed_refresh_complete,
+    update_feed_refresh_failed,
     read_feed_by_id,
     update_feed_status,
     read_new_feeds,
     read_busy_feeds,
+    claim_feed,
+    claim_overdue_feeds,
+    release_expired_feed_leases,
 )
 from core.database.crud.config_key import read_config_key
-from core.feeds.helpers import get_mappings
+from core.database.crud.feed_cursor import upsert_feed_cursors
+from core.feeds.helpers import get_mappings, get_bulk_options, get_rollover_options
 from core.elasticsearch.utils import bulk_index
 from core.elasticsearch.api import ElasticApiHelper
 
 
-async def async_work_refresh_feed(feed_id: int):
-    elastic = ElasticApiHelper()
-    async with create_db() as database:
-        feed = await read_feed_by_id(database, feed_id)
-        if not feed:
-            logging.error(
-                f"Async Work Refresh Feed : Feed Does Not Exist : Feed ID {feed_id}"
-            )
-            return False
-        updated = await update_feed_status(database, feed.id, BottifyStatus.Busy)
+# Runs the refresh of a feed this worker has already claimed, every exit path releases the claim
+async def async_work_run_claimed_feed(database, elastic: ElasticApiHelper, feed: FeedModel):
+    # Anything that stops the refresh after the claim must release it, otherwise the feed sits Busy until the lease expires
+    # Only a feed that can never run goes to Error, a refresh that raised is rescheduled after a backoff
+    success, retry = False, True
+    try:
         if not feed.result_generator:
             logging.error(
                 f"Async Work Refresh Feed : Tried to Refresh Feed with No Result Generator : Feed ID {feed.id}"
             )
+            retry = False
             return False
-        elastic.index_generator(
-            feed.index_name,
-            feed.result_generator(
-                configs=feed.configs, database=database, index_name=feed.index_name
+        # Result generators block on exchange APIs and submit their own DB work back to this loop, so they must run off of it
+        loop = asyncio.get_running_loop()
+        checkpoints = {}
+        indexed = await loop.run_in_executor(
+            None,
+            partial(
+                elastic.index_generator,
+                feed.index_name,
+                feed.result_generator(
+                    configs=feed.configs,
+                    database=database,
+                    index_name=feed.index_name,
+                    checkpoints=checkpoints,
+                ),
+                **get_bulk_options(feed.configs or {}),
             ),
         )
-        complete = await update_feed_refresh_complete(database, feed.id, True)
-        logging.info(
-            f"Async Work Refresh Feed : Refresh Completed Successfully : Feed ID {feed_id}"
+        # Cursors only move once everything they cover is in Elastic, a failed flush re-fetches the same pages next run
+        if indexed and checkpoints:
+            async with database.transaction():
+                for exchange_id, cursors in checkpoints.items():
+                    await upsert_feed_cursors(database, exchange_id, cursors)
+        elif checkpoints:
+            logging.error(
+                f"Async Work Refresh Feed : Indexing Reported Failures, Skipping Checkpoint : Feed ID {feed.id}"
+            )
+        success = True
+    except Exception as e:
+        logging.error(
+            f"Async Work Refresh Feed : Refresh Failed : Feed ID {feed.id} : Error {e}"
         )
-        return
+        raise
+    finally:
+        if success or not retry:
+            await update_feed_refresh_complete(database, feed.id, success)
+        else:
+            await update_feed_refresh_failed(
+                database, feed.id, settings.FeedRetryBackoffSeconds
+            )
+    logging.info(
+        f"Async Work Refresh Feed : Refresh Completed Successfully : Feed ID {feed.id}"
+    )
+    return True
+
+
+async def async_work_refresh_feed(feed_id: int):
+    elastic = ElasticApiHelper()
+    async with use_worker_db() as database:
+        # Claiming marks the feed Busy in the same statement, a duplicate dispatch of the same feed gets nothing back
+        feed = await claim_feed(database, feed_id, settings.FeedLeaseSeconds)
+        if not feed:
+            logging.warning(
+                f"Async Work Refresh Feed : Feed Missing, Inactive, Not Due or Already Claimed : Feed ID {feed_id}"
+            )
+            return False
+        return await async_work_run_claimed_feed(database, elastic, feed)
+
+
+# Workers pull whichever feeds are overdue instead of being handed an ID, SKIP LOCKED means concurrent workers never claim the same feed
+# A wake up that finds nothing due (another worker got there first) is a no-op
+async def async_work_refresh_overdue_feeds(limit: int = 1):
+    elastic = ElasticApiHelper()
+    refreshed = []
+    async with use_worker_db() as database:
+        feeds = await claim_overdue_feeds(database, limit, settings.FeedLeaseSeconds)
+        for feed in feeds:
+            try:
+                if await async_work_run_claimed_feed(database, elastic, feed):
+                    refreshed.append(feed.id)
+            except Exception as e:
+                # Already rescheduled by async_work_run_claimed_feed, keep going so the rest of the batch isn't stuck Busy
+                logging.error(
+                    f"Async Work Refresh Overdue Feeds : Refresh Failed : Feed ID {feed.id} : Error {e}"
+                )
+    return refreshed
 
 
 async def async_work_set_feed_indexes():
     elastic = ElasticApiHelper()
     settings = {"index.mappings.single_type": "true"}
-    async with create_db() as database:
+    async with use_worker_db() as database:
         for feed in await read_new_feeds(database):
             mappings = get_mappings(feed)
             if not feed:
@@ -58,33 +127,27 @@ async def async_work_set_feed_indexes():
                     f"Async Work Set Feed Indexes : Failed to Set Mappings for Feed : Feed ID {feed.id}"
                 )
                 continue
-            if elastic.create_index(feed.index_name, mappings):
+            rollover = get_rollover_options(feed.configs or {})
+            if rollover:
+                created = elastic.create_rollover_index(
+                    feed.index_name, mappings, rollover
+                )
+            else:
+                created = elastic.create_index(feed.index_name, mappings)
+            if created:
                 await update_feed_status(database, feed.id, BottifyStatus.Active)
             else:
                 await update_feed_status(database, feed.id, BottifyStatus.Error)
 
 
-# NOTIMPLEMENTED holding off on this task until we encounter another problem with them sticking
-async def async_work_release_stuck_feeds():
-    async with create_db() as database:
-        stuck_after_minutes_ck = await read_config_key(
-            database, ConfigKey.FeedStuckAfterMinutes
-        )
-        if not stuck_after_minutes_ck:
-            logging.error(
-                f"Async Work Release Stuck Feeds : Failed to Load Required Config Key : Key Name {str(ConfigKey.FeedStuckAfterMinutes)}"
-            )
-            return
-        stuck_feed_names = []
-        feed_count = 0
-        for feed in await read_busy_feeds(database):
-            now = datetime.now(tz=timezone.utc)
-            min_execution_time = now - timedelta(minutes=stuck_after_minutes_ck.value)
-            if feed.last_executed_at < min_execution_time:
-                stuck_feed_names.append(feed.name)
-                await update_feed_status(database, feed.id, BottifyStatus.Active)
-            feed_count += 1
-        logging.info(
-            f"Async Work Release Stuck Feeds : Completed Successfully : Total Feeds {feed_count} : Stuck Feeds {len(stuck_feed_names)} : Stuck Names {stuck_feed_names}"
+# Leases replace the old FeedStuckAfterMinutes check, a feed is stuck once the worker that claimed it lets the lease run out
+async def async_work_release_stuck_feeds(database=None):
+    if database is None:
+        async with use_worker_db() as database:
+            return await async_work_release_stuck_feeds(database)
+    released = await release_expired_feed_leases(database)
+    if released:
+        logging.warning(
+            f"Async Work Release Stuck Feeds : Released Expired Leases : Feed IDs {released}"
         )
-        return
+    return released
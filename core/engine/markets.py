@@ -2,18 +2,32 @@ import logging
 from pydantic import ValidationError
 from databases import Database
 
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.database.crud.exchange import read_exchange_by_id, read_all_active_exchanges
-from core.database.crud.currency import read_currency_by_symbol
+from core.database.crud.currency import read_currency_symbol_map
 from core.database.crud.market import (
-    read_market_by_exchange_symbol,
-    create_market,
-    update_market,
+    read_markets_by_exchange,
+    upsert_markets,
 )
 from core.exchanges.helpers import transform_exchange_market
+from core.models.market import MarketInModel, MarketModel
 
 
-async def async_work_update_exchange_markets(exchange_id: int, database: Database):
+# Compares the columns upsert_markets writes, unchanged markets are skipped entirely
+def market_has_changed(db_market: MarketModel, new_market: MarketInModel):
+    return (
+        db_market.base_currency_id != new_market.base_currency_id
+        or db_market.quote_currency_id != new_market.quote_currency_id
+        or db_market.status != new_market.status
+        or db_market.min_trade_size != new_market.min_trade_size
+        or db_market.notice != new_market.notice
+        or (db_market.tags or None) != (new_market.tags or None)
+    )
+
+
+async def async_work_update_exchange_markets(
+    exchange_id: int, database: Database, currency_ids: dict = None
+):
 
     exchange = await read_exchange_by_id(database, exchange_id)
     if not exchange:
@@ -21,20 +35,28 @@ async def async_work_update_exchange_markets(exchange_id: int, database: Databas
             f"Update Exchange Markets : No Exchange Row for ID : ID {str(exchange_id)}"
         )
         return False
-    exchange_markets = exchange.api(exchange).get_markets()
+    db_markets = {
+        market.symbol: market
+        for market in await read_markets_by_exchange(database, exchange.id)
+        if market
+    }
+    exchange_markets = await exchange.api(exchange).async_get_markets()
+    symbols = set()
     for exchange_market in exchange_markets:
-        base_currency = await read_currency_by_symbol(
-            database, exchange_market.base_currency_symbol
-        )
-        if not base_currency:
+        symbols.add(exchange_market.base_currency_symbol)
+        symbols.add(exchange_market.quote_currency_symbol)
+    if currency_ids is None or symbols.difference(currency_ids):
+        currency_ids = await read_currency_symbol_map(database, symbols)
+    changed_markets = []
+    for exchange_market in exchange_markets:
+        base_currency_id = currency_ids.get(exchange_market.base_currency_symbol)
+        if not base_currency_id:
             logging.debug(
                 f"Update Exchange Markets : No Currency Row for Base Currency : Symbol {exchange_market.base_currency_symbol}"
             )
             continue
-        quote_currency = await read_currency_by_symbol(
-            database, exchange_market.quote_currency_symbol
-        )
-        if not quote_currency:
+        quote_currency_id = currency_ids.get(exchange_market.quote_currency_symbol)
+        if not quote_currency_id:
             logging.debug(
                 f"Update Exchange Markets : No Currency Row for Quote Currency : Symbol {exchange_market.quote_currency_symbol}"
             )
@@ -43,28 +65,33 @@ async def async_work_update_exchange_markets(exchange_id: int, database: Databas
             exchange_market,
             exchange.id,
             exchange.exchange_type,
-            base_currency.id,
-            quote_currency.id,
+            base_currency_id,
+            quote_currency_id,
         )
         if not new_market:
             logging.error(f"Update Exchange Markets : Market Transform Failed")
             continue
-        db_market = await read_market_by_exchange_symbol(
-            database, exchange.id, new_market.symbol
+        db_market = db_markets.get(new_market.symbol)
+        if db_market and not market_has_changed(db_market, new_market):
+            continue
+        changed_markets.append(new_market)
+    success = await upsert_markets(database, changed_markets)
+    if not success:
+        logging.error(
+            f"Update Exchange Markets : Failed to Upsert Markets : Exchange ID {exchange.id}"
         )
-        if not db_market:
-            logging.info(
-                f"Update Exchange Markets : No Market Row for Exchange Market, Creating : Symbol {new_market.symbol} : Exchange ID {exchange.id}"
-            )
-            success = await create_market(database, new_market)
-            if not success:
-                logging.error(f"Update Exchange Markets : Failed to Create New Market")
-        else:
-            await update_market(database, db_market.id, new_market)
+        return False
+    logging.info(
+        f"Update Exchange Markets : Complete : Exchange ID {exchange.id} : Exchange Markets {len(exchange_markets)} : Changed {len(changed_markets)}"
+    )
+    return True
 
 
 async def async_work_update_all_markets():
-    async with create_db() as database:
+    async with use_worker_db() as database:
+        currency_ids = await read_currency_symbol_map(database)
         exchanges = await read_all_active_exchanges(database)
         for exchange in exchanges:
-            await async_work_update_exchange_markets(exchange.id, database)
+            await async_work_update_exchange_markets(
+                exchange.id, database, currency_ids
+            )
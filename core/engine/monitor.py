@@ -1,20 +1,22 @@
 from core.elasticsearch.api import ElasticApiHelper
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.models.monitor import MonitorInModel
 from core.database.crud.monitor import (
     read_monitor_by_source_id,
     create_monitor,
     update_monitor,
 )
+import asyncio
 import logging
 from pydantic import ValidationError
+from core.utils.pubsub import MonitorCacheChannel, publish_invalidation
 
 logger = logging.getLogger("Bottify.Tasks.Monitor")
 
 
 async def async_work_refresh_monitor(monitor_source_id: str):
     eah = ElasticApiHelper()
-    async with create_db() as database:
+    async with use_worker_db() as database:
         new_monitor = eah.get_monitor(monitor_source_id)
         if not new_monitor:
             logger.error(
@@ -48,3 +50,7 @@ async def async_work_refresh_monitor(monitor_source_id: str):
                 logger.error(
                     f"Async Work Refresh Monitor : Failed to Update Monitor in Database"
                 )
+    # Tell the API process to drop its cached copy of this monitor
+    await asyncio.get_running_loop().run_in_executor(
+        None, publish_invalidation, MonitorCacheChannel, monitor_source_id
+    )
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 from pydantic import ValidationError
+from typing import List, Tuple
 from databases import Database
 from core.enums.budget_results import BudgetResult
 from core.models.budget import BudgetInModel
@@ -7,16 +9,17 @@ from core.enums.orders import OrderDirection
 from core.enums.statuses import BottifyStatus
 from core.models.exchange import ExchangeModel
 from core.models.market import MarketModel
-from core.database.database import create_db
+from core.config import settings
+from core.database.database import use_worker_db
 from core.models.order import BottifyOrderCreateModel, BottifyOrderModel
-from core.database.crud.market import read_market_by_id
+from core.database.crud.market import read_market_by_id, read_markets_by_ids
 from core.database.crud.trade import (
     create_trade,
     read_trade_by_source_id,
     read_trade_by_id,
 )
 from core.models.budget import BudgetModel
-from core.database.crud.exchange import read_exchange_by_id
+from core.database.crud.exchange import read_exchange_by_id, read_exchanges_by_ids
 from core.database.crud.bottify_order import (
     create_order,
     read_open_orders,
@@ -32,20 +35,27 @@ from core.database.crud.budget import (
 )
 
 
-async def async_work_place_order(order_in: BottifyOrderCreateModel):
+# Callers that already hold the order's market and exchange (i.e. reactions) can pass them in to skip the reads
+async def async_work_place_order(
+    order_in: BottifyOrderCreateModel,
+    market: MarketModel = None,
+    exchange: ExchangeModel = None,
+):
     if not isinstance(order_in, BottifyOrderCreateModel):
         logging.error(
             f"Place Order : Input Must be a BottifyOrderCreateModel : Got {type(order_in)}"
         )
         return
-    async with create_db() as database:
-        market = await read_market_by_id(database, order_in.market_id)
+    async with use_worker_db() as database:
+        if not market or market.id != order_in.market_id:
+            market = await read_market_by_id(database, order_in.market_id)
         if not market:
             logging.error(
                 f"Place Order : No Market Found for ID : Market ID {order_in.market_id}"
             )
             return
-        exchange = await read_exchange_by_id(database, market.exchange_id)
+        if not exchange or exchange.id != market.exchange_id:
+            exchange = await read_exchange_by_id(database, market.exchange_id)
         if not exchange:
             logging.error(
                 f"Place Order : No Exchange Found for Market : Exchange ID {market.exchange_id}"
@@ -75,7 +85,9 @@ async def async_work_place_order(order_in: BottifyOrderCreateModel):
                 f"Place Order : Failed to Lock Budget : {str(response)} : Order Details {order_in.json()}"
             )
             return
-        new_bottify_order = exchange.api(exchange).place_order(order_in, market.symbol)
+        new_bottify_order = await exchange.api(exchange).async_place_order(
+            order_in, market.symbol
+        )
         created = await create_order(database, new_bottify_order)
         if not created:
             logging.error(f"Work Place Order : Failed to Create Order in Database")
@@ -83,48 +95,105 @@ async def async_work_place_order(order_in: BottifyOrderCreateModel):
 
 
 async def async_work_refresh_open_orders():
-    order_counter = 0
-    db = create_db()
-    async with db as database:
+    async with use_worker_db() as database:
         open_orders = await read_open_orders(database)
         if not open_orders:
             logging.error("Work Refresh Open Orders : No Open Orders")
             return
-        num_orders = len(open_orders)
+        markets = await read_markets_by_ids(
+            database, [order.market_id for order in open_orders]
+        )
+        exchanges = await read_exchanges_by_ids(
+            database, [market.exchange_id for market in markets.values()]
+        )
+        exchange_orders = {}
         for order in open_orders:
-            order_counter += 1
-            market = await read_market_by_id(database, order.market_id)
+            market = markets.get(order.market_id)
             if not market:
                 logging.error(
                     f"Work Refresh Open Orders : No Market Found for Order : Order ID {order.id} : Market ID {order.market_id}"
                 )
                 continue
-            exchange = await read_exchange_by_id(database, market.exchange_id)
+            exchange = exchanges.get(market.exchange_id)
             if not exchange:
                 logging.error(
                     f"Work Refresh Open Orders : No Exchange Found for Order Market : Market ID {market.id} : Exchange ID {market.exchange_id}"
                 )
                 continue
-            exchange_order = exchange.api(exchange).get_order(order)
-            if not exchange_order:
+            exchange_orders.setdefault(exchange.id, []).append((order, market))
+        # Exchanges are refreshed concurrently, each one bounded by its own limit so we don't trip per-exchange rate limits
+        results = await asyncio.gather(
+            *[
+                refresh_exchange_orders(database, exchanges[exchange_id], orders)
+                for exchange_id, orders in exchange_orders.items()
+            ],
+            return_exceptions=True,
+        )
+        refreshed = 0
+        for exchange_id, result in zip(exchange_orders, results):
+            if isinstance(result, Exception):
                 logging.error(
-                    "Work Refresh Open Orders : Failed to Retrieve Updated Order from Exchange"
+                    f"Work Refresh Open Orders : Exchange Refresh Failed : Exchange ID {exchange_id} : Error {result}"
                 )
                 continue
+            refreshed += result
+        logging.info(
+            f"Work Refresh Open Orders : Complete : Total Orders {len(open_orders)} : Refreshed {refreshed} : Exchanges {len(exchange_orders)}"
+        )
 
-            trades_handled = await handle_trades(database, order, exchange, market)
-            if trades_handled and exchange_order.status == BottifyStatus.Complete:
-                success = await update_order_status(
-                    database, order.id, exchange_order.status
-                )
-                if not success:
-                    logging.error(
-                        f"Work Refresh Open Orders : Failed to Update Order Status in Database : Order ID {order.id} : New Status {updated_order.status}"
-                    )
 
-            logging.info(
-                f"Work Refresh Open Orders : {order_counter} of {num_orders} Complete : Success True"
+async def refresh_exchange_orders(
+    database: Database,
+    exchange: ExchangeModel,
+    orders: List[Tuple[BottifyOrderModel, MarketModel]],
+):
+    semaphore = asyncio.Semaphore(settings.OpenOrderRefreshConcurrency)
+    api = exchange.api(exchange)
+    results = await asyncio.gather(
+        *[
+            refresh_open_order(database, semaphore, api, order, exchange, market)
+            for order, market in orders
+        ],
+        return_exceptions=True,
+    )
+    refreshed = 0
+    for (order, _), result in zip(orders, results):
+        if isinstance(result, Exception):
+            logging.error(
+                f"Refresh Exchange Orders : Order Refresh Failed : Exchange ID {exchange.id} : Order ID {order.id} : Error {result}"
+            )
+        elif result:
+            refreshed += 1
+    logging.info(
+        f"Refresh Exchange Orders : Exchange Complete : Exchange ID {exchange.id} : Orders {len(orders)} : Refreshed {refreshed}"
+    )
+    return refreshed
+
+
+async def refresh_open_order(
+    database: Database,
+    semaphore: asyncio.Semaphore,
+    api,
+    order: BottifyOrderModel,
+    exchange: ExchangeModel,
+    market: MarketModel,
+):
+    async with semaphore:
+        exchange_order = await api.async_get_order(order)
+        if not exchange_order:
+            logging.error(
+                f"Refresh Open Order : Failed to Retrieve Updated Order from Exchange : Order ID {order.id}"
             )
+            return False
+        trades_handled = await handle_trades(database, order, exchange, market, api)
+    if trades_handled and exchange_order.status == BottifyStatus.Complete:
+        success = await update_order_status(database, order.id, exchange_order.status)
+        if not success:
+            logging.error(
+                f"Refresh Open Order : Failed to Update Order Status in Database : Order ID {order.id} : New Status {exchange_order.status}"
+            )
+            return False
+    return True
 
 
 async def handle_budget(
@@ -156,8 +225,11 @@ async def handle_trades(
     order: BottifyOrderModel,
     exchange: ExchangeModel,
     market: MarketModel,
+    api=None,
 ):
-    trades = exchange.api(exchange).get_trades_by_order(order.source_id, order.id)
+    if not api:
+        api = exchange.api(exchange)
+    trades = await api.async_get_trades_by_order(order.source_id, order.id)
     if not trades:
         logging.error("Handle Trades : Failed to Retrieve Order Trades from Exchange")
         return False
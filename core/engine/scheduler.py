@@ -0,0 +1,143 @@
+import asyncio
+import heapq
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from databases import Database
+
+from core.config import settings
+from core.database.crud.feeds import read_active_feed_schedule
+from core.engine.feeds import async_work_release_stuck_feeds
+
+
+def dispatch_feed_refresh(feed_id: int):
+    from core.worker import bottify_worker
+
+    bottify_worker.send_task(
+        "core.worker.refresh_feed",
+        kwargs={"feed_id": feed_id},
+        queue=settings.CeleryFeedTaskQueue,
+    )
+
+
+# Scheduled refreshes don't name a feed, each task claims up to batch_size overdue feeds itself (see claim_overdue_feeds)
+# Sends enough tasks to cover every due feed, a task that wakes up after the feeds were claimed elsewhere does nothing
+def dispatch_overdue_feed_refreshes(count: int, batch_size: int = None):
+    from core.worker import bottify_worker
+
+    batch_size = max(batch_size or settings.FeedClaimBatchSize, 1)
+    for _ in range(math.ceil(count / batch_size)):
+        bottify_worker.send_task(
+            "core.worker.refresh_overdue_feeds",
+            kwargs={"limit": batch_size},
+            queue=settings.CeleryFeedTaskQueue,
+        )
+
+
+# Keeps Active feeds in a min-heap keyed on next_execution_at and wakes the workers the moment feeds come due
+# The heap is rebuilt from the database every sync so new, paused and completed feeds are picked up without an API hop
+class FeedScheduler:
+    def __init__(
+        self,
+        database: Database,
+        dispatch=dispatch_overdue_feed_refreshes,
+        sync_seconds: float = None,
+        redispatch_seconds: float = None,
+    ):
+        self.logger = logging.getLogger("Bottify.FeedScheduler")
+        self.database = database
+        self.dispatch = dispatch
+        self.sync_seconds = sync_seconds or settings.FeedSchedulerSyncSeconds
+        self.redispatch_seconds = (
+            redispatch_seconds or settings.FeedSchedulerRedispatchSeconds
+        )
+        self.heap = []
+        self.dispatched = {}  # Feed ID -> (due timestamp when dispatched, monotonic dispatch time)
+        self.wake = None
+        self.running = False
+
+    async def sync(self):
+        await async_work_release_stuck_feeds(self.database)
+        schedule = await read_active_feed_schedule(self.database)
+        now = time.time()
+        heap = []
+        for feed_id, next_execution_at in schedule:
+            due_at = next_execution_at.timestamp() if next_execution_at else now
+            dispatched = self.dispatched.get(feed_id)
+            if dispatched:
+                dispatched_due_at, dispatched_at = dispatched
+                # A refresh that has not completed yet leaves next_execution_at untouched, don't send it twice
+                if (
+                    dispatched_due_at == due_at
+                    and time.monotonic() - dispatched_at < self.redispatch_seconds
+                ):
+                    continue
+                del self.dispatched[feed_id]
+            heap.append((due_at, feed_id))
+        heapq.heapify(heap)
+        self.heap = heap
+        # Busy or deleted feeds drop out of the schedule, they are scheduled fresh once they come back Active
+        active_ids = {feed_id for feed_id, _ in schedule}
+        self.dispatched = {
+            feed_id: dispatched
+            for feed_id, dispatched in self.dispatched.items()
+            if feed_id in active_ids
+        }
+        self.logger.debug(
+            f"Feed Scheduler : Synced : Scheduled {len(self.heap)} : In Flight {len(self.dispatched)}"
+        )
+
+    # The broker publish blocks, so the sends run in the default executor instead of stalling the loop
+    # Workers pick which feeds to claim, the heap only decides how many are due right now
+    async def dispatch_due(self):
+        loop = asyncio.get_running_loop()
+        now = time.time()
+        due = []
+        while self.heap and self.heap[0][0] <= now:
+            due.append(heapq.heappop(self.heap))
+        if not due:
+            return
+        try:
+            await loop.run_in_executor(None, self.dispatch, len(due))
+        except Exception as e:
+            # Left out of dispatched so the next sync schedules them again
+            self.logger.error(
+                f"Feed Scheduler : Dispatch Failed : Due Feeds {len(due)} : Error {e}"
+            )
+            return
+        dispatched_at = time.monotonic()
+        for due_at, feed_id in due:
+            self.dispatched[feed_id] = (due_at, dispatched_at)
+        self.logger.info(
+            f"Feed Scheduler : Dispatched : Due Feeds {len(due)} : Late by {now - due[0][0]:.3f}s"
+        )
+
+    async def run(self):
+        self.running = True
+        self.wake = asyncio.Event()
+        next_sync_at = 0
+        self.logger.info(
+            f"Feed Scheduler : Started : Sync Seconds {self.sync_seconds}"
+        )
+        while self.running:
+            if time.monotonic() >= next_sync_at:
+                try:
+                    await self.sync()
+                except Exception as e:
+                    self.logger.error(f"Feed Scheduler : Sync Failed : Error {e}")
+                next_sync_at = time.monotonic() + self.sync_seconds
+            await self.dispatch_due()
+            timeout = next_sync_at - time.monotonic()
+            if self.heap:
+                timeout = min(timeout, self.heap[0][0] - time.time())
+            try:
+                await asyncio.wait_for(self.wake.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
+        self.logger.info("Feed Scheduler : Stopped")
+
+    def stop(self):
+        self.running = False
+        if self.wake:
+            self.wake.set()
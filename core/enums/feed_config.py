@@ -11,3 +11,20 @@ class FeedConfig(Enum):
     NewestCandle = "newest_candle_search_template"
     MaxResults = "max_results"
     MaxResultsPerMarket = "max_results_per_market"
+    MaxWorkers = "max_workers"
+    MaxPages = "max_pages"
+    BulkChunkSize = "bulk_chunk_size"
+    BulkMaxChunkBytes = "bulk_max_chunk_bytes"
+    BulkThreadCount = "bulk_thread_count"
+    # "create" skips documents already indexed under the same natural key _id, "index" overwrites them
+    # Either only dedupes within one index, on a rollover feed a page retried after the write index rolled over lands a second copy in the new one
+    OpType = "op_type"
+    # Rollover feeds should get exactly-once from their feed cursors (e.g. Coinbase trades), not from _id, and keep a retry well inside one period
+    # Feeds that depend on re-fetching overlapping results and letting _id absorb the duplicates (tickers, candles, CMC) should stay on a single index
+    RolloverPeriod = "rollover_period"
+    RolloverMaxAge = "rollover_max_age"
+    RolloverMaxSize = "rollover_max_size"
+    RolloverMaxDocs = "rollover_max_docs"
+    ForceMergeAfter = "force_merge_after"
+    Retention = "retention"
+    NumberOfShards = "number_of_shards"
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+# Values are the date math used in backing index names, e.g. trades-2021.06.01-000001
+class RolloverPeriod(Enum):
+    Daily = "daily"
+    Monthly = "monthly"
@@ -23,7 +23,11 @@ from requests.exceptions import ConnectionError, ReadTimeout
 from typing import Dict
 from datetime import datetime, timezone
 import hmac
+import json
 from json.decoder import JSONDecodeError
+from aiohttp import ClientError, ClientTimeout
+from yarl import URL
+from core.exchanges.sessions import get_client_session
 
 
 def get_timestamp():
@@ -77,14 +81,23 @@ class BittrexApiHelper:
     # TODO Change this to support different accounts for different users somehow
     def set_auth(self, uri, method, body=None):
         self.is_ready = False
+        headers = self.get_auth_headers(uri, method, body)
+        if not headers:
+            return self
+        self.session.headers.update(headers)
+        self.is_ready = True
+        return self
+
+    # Builds signed headers without touching shared session state, so concurrent async requests can't clobber each other
+    def get_auth_headers(self, uri, method, body=None):
         if not self.api_key:
             self.logger.error(
                 f"BittrexApiHelpers : Failed to Set Auth Headers : API Key is None"
             )
-            return self
+            return None
         if not body:
             body = ""
-        else:
+        elif not isinstance(body, str):
             body = json.dumps(body)
         timestamp = get_timestamp()
         content_hash = get_content_hash(body)
@@ -92,19 +105,19 @@ class BittrexApiHelper:
             self.logger.error(
                 f"BittrexApiHelpers : Failed to Set Auth Headers : Content Hash is None"
             )
-            return self
+            return None
         signature = get_signature(self.api_secret, uri, timestamp, method, content_hash)
         if not signature:
             self.logger.error(
                 f"BittrexApiHelpers : Failed to Sign API Request : Signature is None"
             )
-            return self
-        self.session.headers.update({"Api-Key": self.api_key})
-        self.session.headers.update({"Api-Timestamp": str(timestamp)})
-        self.session.headers.update({"Api-Content-Hash": content_hash})
-        self.session.headers.update({"Api-Signature": signature})
-        self.is_ready = True
-        return self
+            return None
+        return {
+            "Api-Key": self.api_key,
+            "Api-Timestamp": str(timestamp),
+            "Api-Content-Hash": content_hash,
+            "Api-Signature": signature,
+        }
 
     def make_request(
         self,
@@ -153,14 +166,82 @@ class BittrexApiHelper:
             )
             return None
 
+    # Async variant of make_request, uses the keep-alive session shared by every helper talking to this exchange host
+    async def async_make_request(
+        self,
+        method: str,
+        endpoint: str,
+        body: Dict = None,
+        params: Dict = None,
+        use_auth: bool = True,
+    ):
+        url = get_request_url(self.base_url, endpoint)
+        if isinstance(method, HttpRequestType):
+            method_str = method.value
+        else:
+            method_str = method
+        if not url:
+            self.logger.error(f"Async Make Request : Request URL is None")
+            return None
+        request_url = URL(url)
+        if params:
+            request_url = request_url.with_query(params)
+        if body and not isinstance(body, str):
+            body = json.dumps(body)
+        headers = None
+        if use_auth:
+            headers = self.get_auth_headers(str(request_url), method_str, body)
+            if not headers:
+                return None
+        session = get_client_session(self.base_url)
+        try:
+            async with session.request(
+                method_str,
+                request_url,
+                data=body,
+                headers=headers,
+                timeout=ClientTimeout(total=self.timeout),
+            ) as response:
+                if method_str == HttpRequestType.Head.value:
+                    return response.headers
+                text = await response.text()
+                if response.status >= 400:
+                    self.logger.critical(
+                        f"Async Make Request : Response Status Code indicates an Error : Status Code {response.status} : Endpoint: {url} : Data {text}"
+                    )
+        except asyncio.TimeoutError:
+            self.logger.critical(
+                f"Async Make Request : API Operation Timeout : Max Timeout {self.timeout}"
+            )
+            return None
+        except ClientError as ce:
+            self.logger.critical(f"Async Make Request : ClientError : {ce}")
+            return None
+        try:
+            return json.loads(text)
+        except JSONDecodeError as jde:
+            self.logger.critical(
+                f"Async Make Request : JSON Decode Error : {jde} : Data {text}"
+            )
+            return None
+
     def get_account(self):
         endpoint = "account"
         return self.make_request("GET", endpoint)
 
     def get_balances(self):
         endpoint = "balances"
-        response = self.make_request("GET", endpoint)
+        return self.load_balances(self.make_request("GET", endpoint))
+
+    async def async_get_balances(self):
+        endpoint = "balances"
+        return self.load_balances(await self.async_make_request("GET", endpoint))
+
+    def load_balances(self, response):
         balances = []
+        if not response:
+            self.logger.error(f"Bittrex Get Balances : Invalid API Response")
+            return balances
         for item in response:
             try:
                 balance = BittrexBalanceModel(**item)
@@ -185,8 +266,20 @@ class BittrexApiHelper:
 
     def get_markets(self):
         endpoint = "markets"
+        return self.load_markets(
+            self.make_request(method="GET", endpoint=endpoint, use_auth=False)
+        )
+
+    async def async_get_markets(self):
+        endpoint = "markets"
+        return self.load_markets(
+            await self.async_make_request(
+                method="GET", endpoint=endpoint, use_auth=False
+            )
+        )
+
+    def load_markets(self, response):
         markets = []
-        response = self.make_request(method="GET", endpoint=endpoint, use_auth=False)
         if not response:
             self.logger.error(f"Bittrex Get Markets : Response Data Missing or Invalid")
             return markets
@@ -205,8 +298,21 @@ class BittrexApiHelper:
 
     def get_trades_by_order(self, source_order_id: UUID, bottify_order_id: UUID):
         endpoint = f"orders/{str(source_order_id)}/executions"
-        trades = []
         response = self.make_request(method="GET", endpoint=endpoint)
+        return self.load_trades_by_order(response, bottify_order_id)
+
+    async def async_get_trades_by_order(
+        self, source_order_id: UUID, bottify_order_id: UUID
+    ):
+        endpoint = f"orders/{str(source_order_id)}/executions"
+        response = await self.async_make_request(method="GET", endpoint=endpoint)
+        return self.load_trades_by_order(response, bottify_order_id)
+
+    def load_trades_by_order(self, response, bottify_order_id: UUID):
+        trades = []
+        if not response:
+            self.logger.error("Get Trades by Order : Invalid API Response")
+            return trades
         for item in response:
             try:
                 btx_trade = BittrexTradeModel(**item)
@@ -267,7 +373,40 @@ class BittrexApiHelper:
             )
             return None
         endpoint = f"markets/{symbol}/ticker"
+        return self.load_ticker(
+            self.make_request(method="GET", endpoint=endpoint, use_auth=False)
+        )
+
+    async def async_get_ticker(self, symbol: str):
+        if not isinstance(symbol, str):
+            self.logger.error(
+                f"Get Ticker : Symbol Must be a String : Got {type(symbol)}"
+            )
+            return None
+        endpoint = f"markets/{symbol}/ticker"
+        return self.load_ticker(
+            await self.async_make_request(
+                method="GET", endpoint=endpoint, use_auth=False
+            )
+        )
+
+    # Every market's ticker in one request, used by the ticker feed instead of calling get_ticker per market
+    def get_tickers(self):
+        endpoint = "markets/tickers"
         response = self.make_request(method="GET", endpoint=endpoint, use_auth=False)
+        tickers = []
+        if not isinstance(response, list):
+            self.logger.error(f"Get Tickers : Invalid API Response : Data {response}")
+            return tickers
+        for item in response:
+            ticker = self.load_ticker(item)
+            if ticker:
+                tickers.append(ticker)
+        if not tickers:
+            self.logger.error(f"Get Tickers : No Results")
+        return tickers
+
+    def load_ticker(self, response):
         if not response:
             self.logger.error("Get Ticker : Invalid API Response")
             return None
@@ -286,7 +425,20 @@ class BittrexApiHelper:
             )
             return None
         endpoint = f"orders/{order_source_id}"
-        response = self.make_request(method="GET", endpoint=endpoint)
+        return self.load_order(self.make_request(method="GET", endpoint=endpoint))
+
+    async def async_get_order(self, order_source_id: UUID):
+        if not isinstance(order_source_id, UUID):
+            self.logger.error(
+                f"Get Order : Order Source ID Must be a UUID : Got {type(order_source_id)}"
+            )
+            return None
+        endpoint = f"orders/{order_source_id}"
+        return self.load_order(
+            await self.async_make_request(method="GET", endpoint=endpoint)
+        )
+
+    def load_order(self, response):
         if not response:
             self.logger.error("Get Order : Invalid API Response")
             return None
@@ -87,8 +87,10 @@ class BittrexPublicTradeModel(BaseModel):
     id: str = Field(alias="_id")
     market_symbol: str
     executedAt: datetime = Field(alias="time")
-    quantity: Decimal = Field(alias="size")
-    rate: Decimal = Field(alias="price")  # Required for commonality across exchanges
+    quantity: Decimal = Field(alias="size", es_type="scaled_float")
+    rate: Decimal = Field(
+        alias="price", es_type="scaled_float"
+    )  # Required for commonality across exchanges
     takerSide: str = Field(alias="side")
     snapshot: Optional[int] = None
 
@@ -100,6 +102,7 @@ class BittrexPublicTradeModel(BaseModel):
     class Config:
         allow_population_by_field_name = True
         extra = "ignore"
+        natural_key = ("id",)  # Bittrex trade IDs are UUIDs, unique across markets
 
 
 class BittrexBalanceModel(BaseModel):
@@ -129,9 +132,11 @@ class BittrexMarketModel(BaseModel):
 
 class BittrexTickerModel(BaseModel):
     symbol: str = Field(alias="market_symbol")
-    lastTradeRate: Decimal = Field(alias="price")  # Just call it price ffs?
-    bidRate: Decimal = Field(alias="bid")
-    askRate: Decimal = Field(alias="ask")
+    lastTradeRate: Decimal = Field(
+        alias="price", es_type="scaled_float"
+    )  # Just call it price ffs?
+    bidRate: Decimal = Field(alias="bid", es_type="scaled_float")
+    askRate: Decimal = Field(alias="ask", es_type="scaled_float")
     snapshot: Optional[int] = None
     time: datetime = None
 
@@ -144,6 +149,7 @@ class BittrexTickerModel(BaseModel):
     class Config:
         allow_population_by_field_name = True
         extra = "ignore"
+        natural_key = ("symbol", "snapshot")  # One document per market per ticker sequence
 
 
 class BittrexCandleModel(BaseModel):
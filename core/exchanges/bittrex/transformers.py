@@ -83,10 +83,7 @@ def transform_market_bittrex(
             f"Transform Market Bittrex : Input Must be a BittrexMarketModel : Got {type(bittrex_market)}"
         )
         return None
-    if bittrex_market.tags:
-        tags = json.dumps(bittrex_market.tags)
-    else:
-        tags = None
+    tags = bittrex_market.tags or None
     if bittrex_market.status == BittrexMarketStatus.Active:
         status = BottifyStatus.Active
     elif bittrex_market.status == BittrexMarketStatus.Disabled:
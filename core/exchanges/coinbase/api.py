@@ -31,7 +31,11 @@ from requests.auth import AuthBase
 from typing import Dict, List
 from datetime import datetime, timezone, timedelta
 import hmac
+import json
 from json.decoder import JSONDecodeError
+from aiohttp import ClientError, ClientTimeout
+from yarl import URL
+from core.exchanges.sessions import get_client_session
 
 
 def get_timestamp():
@@ -46,13 +50,20 @@ class CoinbaseExchangeAuth(AuthBase):
         self.passphrase = passphrase
 
     def __call__(self, request):
+        request.headers.update(
+            self.get_headers(request.method, request.path_url, request.body)
+        )
+        return request
+
+    # Shared by the requests AuthBase hook and the async client, which has no prepared request to sign
+    def get_headers(self, method: str, path_url: str, body=None):
         timestamp = str(time.time())
         logging.debug(f"CoinbaseExchangeAuth Timestamp : {timestamp}")
         array = [
             timestamp,
-            request.method,
-            request.path_url,
-            request.body if request.body else "",
+            method,
+            path_url,
+            body if body else "",
         ]
         message = "".join(str(value) for value in array)
         hmac_key = base64.b64decode(self.secret_key)
@@ -64,16 +75,13 @@ class CoinbaseExchangeAuth(AuthBase):
             .rstrip("\n")
         )
 
-        request.headers.update(
-            {
-                "CB-ACCESS-SIGN": signature_b64,
-                "CB-ACCESS-TIMESTAMP": timestamp,
-                "CB-ACCESS-KEY": self.api_key,
-                "CB-ACCESS-PASSPHRASE": self.passphrase,
-                "Content-Type": "application/json",
-            }
-        )
-        return request
+        return {
+            "CB-ACCESS-SIGN": signature_b64,
+            "CB-ACCESS-TIMESTAMP": timestamp,
+            "CB-ACCESS-KEY": self.api_key,
+            "CB-ACCESS-PASSPHRASE": self.passphrase,
+            "Content-Type": "application/json",
+        }
 
 
 class CoinbaseApiHelper:
@@ -112,6 +120,7 @@ class CoinbaseApiHelper:
         params: Dict = None,
         body: Dict = None,
         use_auth: bool = True,
+        include_headers: bool = False,
     ):
         url = f"{self.base_url}/{endpoint}"
         try:
@@ -134,6 +143,8 @@ class CoinbaseApiHelper:
             )
             return None
         try:
+            if include_headers:
+                return response.json(), response.headers
             return response.json()
         except JSONDecodeError as jde:
             self.logger.error(
@@ -141,15 +152,66 @@ class CoinbaseApiHelper:
             )
             return None
 
+    # Async variant of make_request, uses the keep-alive session shared by every helper talking to this exchange host
+    async def async_make_request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Dict = None,
+        body: str = None,
+        use_auth: bool = True,
+    ):
+        url = URL(f"{self.base_url}/{endpoint}")
+        if params:
+            url = url.with_query(params)
+        headers = None
+        if use_auth:
+            headers = self.set_auth().get_headers(method, url.raw_path_qs, body)
+        session = get_client_session(self.base_url)
+        try:
+            async with session.request(
+                method,
+                url,
+                data=body,
+                headers=headers,
+                timeout=ClientTimeout(total=self.timeout),
+            ) as response:
+                text = await response.text()
+                if response.status >= 400:
+                    self.logger.error(
+                        f"Async Make Request : Response Status Code indicates an Error : Status Code {response.status} : Data {text}"
+                    )
+                    return None
+        except asyncio.TimeoutError:
+            self.logger.error(
+                f"Coinbase Async Make Request : API Operation Timeout : Max Timeout {self.timeout}"
+            )
+            return None
+        except ClientError as ce:
+            self.logger.error(f"Coinbase Async Make Request : ClientError : {ce}")
+            return None
+        try:
+            return json.loads(text)
+        except JSONDecodeError as jde:
+            self.logger.error(
+                f"Async Make Request : JSON Decode Error : {jde} : Data {text}"
+            )
+            return None
+
     def get_account(self):
         endpoint = "accounts"
         return self.make_request("GET", endpoint)
 
     def get_balances(self):
         endpoint = "accounts"
-        balances = []
-        response = self.make_request("GET", endpoint)
+        return self.load_balances(self.make_request("GET", endpoint))
 
+    async def async_get_balances(self):
+        endpoint = "accounts"
+        return self.load_balances(await self.async_make_request("GET", endpoint))
+
+    def load_balances(self, response):
+        balances = []
         if not response:
             self.logger.error(
                 f"Coinbase Get Balances : API Call Returned No Data : Balance Update Failed"
@@ -185,8 +247,20 @@ class CoinbaseApiHelper:
 
     def get_markets(self):
         endpoint = "products"
+        return self.load_markets(
+            self.make_request(method="GET", endpoint=endpoint, use_auth=False)
+        )
+
+    async def async_get_markets(self):
+        endpoint = "products"
+        return self.load_markets(
+            await self.async_make_request(
+                method="GET", endpoint=endpoint, use_auth=False
+            )
+        )
+
+    def load_markets(self, response):
         markets = []
-        response = self.make_request(method="GET", endpoint=endpoint, use_auth=False)
         if not response:
             logging.error(
                 f"Coinbase Get Markets : API Call Returned No Data : Market Update Failed"
@@ -266,18 +340,37 @@ class CoinbaseApiHelper:
 
     def place_order(self, order_in, market_symbol):
         endpoint = "orders"
+        cb_order = self.prepare_order(order_in, market_symbol)
+        if not cb_order:
+            return
+        response = self.make_request(
+            "POST", endpoint, body=cb_order.json(exclude_none=True)
+        )
+        return self.load_placed_order(response, order_in)
+
+    async def async_place_order(self, order_in, market_symbol):
+        endpoint = "orders"
+        cb_order = self.prepare_order(order_in, market_symbol)
+        if not cb_order:
+            return
+        response = await self.async_make_request(
+            "POST", endpoint, body=cb_order.json(exclude_none=True)
+        )
+        return self.load_placed_order(response, order_in)
+
+    def prepare_order(self, order_in, market_symbol):
         cb_order = transform_order_create_to_coinbase(order_in, market_symbol)
         if not cb_order:
             self.logger.error(
                 f"Coinbase Place Order : Failed to Transform Bottify Order to Coinbase Order"
             )
-            return
+            return None
         self.logger.info(
             f"Coinbase Place Order : Data {cb_order.json(exclude_none=True)}"
         )
-        response = self.make_request(
-            "POST", endpoint, body=cb_order.json(exclude_none=True)
-        )
+        return cb_order
+
+    def load_placed_order(self, response, order_in):
         if not response:
             self.logger.error("Coinbase Place Order : Invalid API Response")
             return
@@ -303,7 +396,19 @@ class CoinbaseApiHelper:
                 f"Coinbase Get Ticker : Symbol Must be a String : Got {type(symbol)}"
             )
         endpoint = f"products/{symbol}/ticker"
-        response = self.make_request("GET", endpoint, use_auth=False)
+        return self.load_ticker(self.make_request("GET", endpoint, use_auth=False))
+
+    async def async_get_ticker(self, symbol: str):
+        if not isinstance(symbol, str):
+            self.logger.error(
+                f"Coinbase Get Ticker : Symbol Must be a String : Got {type(symbol)}"
+            )
+        endpoint = f"products/{symbol}/ticker"
+        return self.load_ticker(
+            await self.async_make_request("GET", endpoint, use_auth=False)
+        )
+
+    def load_ticker(self, response):
         if not response:
             self.logger.error("Get Ticker : Invalid API Response")
             return
@@ -317,7 +422,17 @@ class CoinbaseApiHelper:
 
     def get_order(self, order_in):
         endpoint = f"orders/{order_in.source_id}"
-        response = self.make_request(method="GET", endpoint=endpoint)
+        return self.load_order(
+            self.make_request(method="GET", endpoint=endpoint), order_in
+        )
+
+    async def async_get_order(self, order_in):
+        endpoint = f"orders/{order_in.source_id}"
+        return self.load_order(
+            await self.async_make_request(method="GET", endpoint=endpoint), order_in
+        )
+
+    def load_order(self, response, order_in):
         if not response:
             self.logger.error("Get Order : Invalid API Response")
             return None
@@ -338,8 +453,24 @@ class CoinbaseApiHelper:
     def get_trades_by_order(self, source_order_id: UUID, bottify_order_id: UUID):
         endpoint = "fills"
         params = {"order_id": str(source_order_id)}
-        trades = []
         response = self.make_request(method="GET", endpoint=endpoint, params=params)
+        return self.load_trades_by_order(response, bottify_order_id)
+
+    async def async_get_trades_by_order(
+        self, source_order_id: UUID, bottify_order_id: UUID
+    ):
+        endpoint = "fills"
+        params = {"order_id": str(source_order_id)}
+        response = await self.async_make_request(
+            method="GET", endpoint=endpoint, params=params
+        )
+        return self.load_trades_by_order(response, bottify_order_id)
+
+    def load_trades_by_order(self, response, bottify_order_id: UUID):
+        trades = []
+        if not response:
+            self.logger.error("Get Trades by Order : Invalid API Response")
+            return trades
         for item in response:
             try:
                 cb_trade = CoinbaseTradeModel(**item)
@@ -392,6 +523,64 @@ class CoinbaseApiHelper:
                 )
                 continue
 
+    # Returns one page of public trades along with the CB-BEFORE pagination cursor (the newest trade_id on the page)
+    def get_public_trades_page(
+        self, symbol: str, before: int = None, limit: int = None
+    ):
+        params = {}
+        if before:
+            params.update({"before": before})
+        if limit:
+            params.update({"limit": limit})
+        endpoint = f"products/{symbol}/trades"
+        result = self.make_request(
+            "GET", endpoint, params, use_auth=False, include_headers=True
+        )
+        if not result:
+            self.logger.error(
+                f"Coinbase Public Trades Page : Invalid API Response : Endpoint {endpoint} : Params {params}"
+            )
+            return None
+        response, headers = result
+        trades = []
+        for trade_data in response:
+            try:
+                trades.append(
+                    CoinbasePublicTradeModel(market_symbol=symbol, **trade_data)
+                )
+            except ValidationError as ve:
+                self.logger.error(
+                    f"Coinbase Public Trades Page : CoinbasePublicTradeModel : ValidationError : {ve.json()}"
+                )
+            except TypeError as te:
+                self.logger.error(
+                    f"Coinbase Public Trades Page : CoinbasePublicTradeModel : TypeError : {str(te)} : Trade Data {trade_data}"
+                )
+        page_before = headers.get("CB-BEFORE")
+        return trades, int(page_before) if page_before else None
+
+    # Follows CB-BEFORE pages from the before cursor until caught up, without a cursor only the newest page is returned
+    def generate_public_trade_pages(
+        self, symbol: str, before: int = None, limit: int = None, max_pages: int = None
+    ):
+        limit = limit or 100  # Coinbase's default page size
+        page_count = 0
+        while True:
+            page = self.get_public_trades_page(symbol, before=before, limit=limit)
+            if not page:
+                return
+            trades, page_before = page
+            yield from trades
+            page_count += 1
+            if not before or not page_before or len(trades) < limit:
+                return
+            if max_pages and page_count >= max_pages:
+                self.logger.info(
+                    f"Coinbase Public Trade Pages : Reached Max Pages : Symbol {symbol} : Max Pages {max_pages}"
+                )
+                return
+            before = page_before
+
     def get_daily_currency_stats(self, symbol: str):
         if not isinstance(symbol, str):
             self.logger.error(
@@ -5,6 +5,7 @@ import requests
 from datetime import datetime, timezone, timedelta
 import asyncio
 from core.elasticsearch.api import ElasticApiHelper
+from core.feeds.helpers import serialized_action
 from core.enums.statuses import BottifyStatus
 from core.exchanges.coinbase.models import (
     CoinbaseSocketTickerModel,
@@ -73,7 +74,7 @@ class CoinbaseSocketFeeder(cbpro.WebsocketClient):
     def gen_ticker_data(self):
         for symbol, ticker in self.tickers.items():
             if isinstance(ticker, CoinbaseSocketTickerModel):
-                yield ticker.dict(by_alias=True)
+                yield serialized_action(ticker)
             else:
                 logging.error(
                     f"Gen Ticker Data : Invalid Ticker Type : Type {type(ticker)} : Value {ticker}"
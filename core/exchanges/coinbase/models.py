@@ -153,16 +153,16 @@ class CoinbaseApiTickerModel(BaseModel):
 class CoinbaseSocketTickerModel(BaseModel):
     sequence: str
     product_id: str = Field(alias="market_symbol")
-    price: Decimal
+    price: Decimal = Field(..., es_type="scaled_float")
     open_24h: Decimal
     volume_24h: Decimal
     low_24h: Decimal
     high_24h: Decimal
     volume_30d: Decimal
     best_bid: Decimal = Field(
-        alias="bid"
+        alias="bid", es_type="scaled_float"
     )  # Required for commonality with other exchanges
-    best_ask: Decimal = Field(alias="ask")
+    best_ask: Decimal = Field(alias="ask", es_type="scaled_float")
     side: str
     time: datetime
     trade_id: int
@@ -171,6 +171,7 @@ class CoinbaseSocketTickerModel(BaseModel):
     class Config:
         extra = "ignore"
         allow_population_by_field_name = True
+        natural_key = ("product_id", "sequence")
 
 
 class CoinbaseSocketFeederConfig(BaseModel):
@@ -186,14 +187,15 @@ class CoinbasePublicTradeModel(BaseModel):
     trade_id: int
     market_symbol: str
     time: datetime
-    price: Decimal
-    size: Decimal
+    price: Decimal = Field(..., es_type="scaled_float")
+    size: Decimal = Field(..., es_type="scaled_float")
     side: str
     id: str = Field(alias="_id", default=None)
 
     class Config:
         allow_population_by_field_name = True
         extra = "ignore"
+        natural_key = ("market_symbol", "trade_id")  # Same as id, kept so existing documents keep their _id
 
     @validator(
         "id", always=True
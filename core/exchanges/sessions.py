@@ -0,0 +1,29 @@
+import logging
+from urllib.parse import urlparse
+from aiohttp import ClientSession, TCPConnector
+from core.config import settings
+
+# One keep-alive session per exchange host, shared by every API helper running on the worker loop
+client_sessions = {}
+
+
+def get_client_session(base_url: str) -> ClientSession:
+    host = urlparse(str(base_url)).netloc
+    session = client_sessions.get(host)
+    if session is None or session.closed:
+        connector = TCPConnector(
+            limit_per_host=settings.ExchangeConnectionLimit,
+            keepalive_timeout=settings.ExchangeKeepAliveSeconds,
+        )
+        session = ClientSession(connector=connector)
+        client_sessions[host] = session
+        logging.debug(f"Get Client Session : Opened Session : Host {host}")
+    return session
+
+
+async def close_client_sessions():
+    for host, session in list(client_sessions.items()):
+        if not session.closed:
+            await session.close()
+        client_sessions.pop(host, None)
+    logging.info("Close Client Sessions : All Exchange Sessions Closed")
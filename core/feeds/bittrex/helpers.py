@@ -1,12 +1,12 @@
-import asyncio
 import logging
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.database.crud.exchange import read_exchange_by_id
 from core.database.crud.market import read_markets_by_exchange
+from core.utils.runtime import run_sync
 
 
 async def async_fetch_markets(exchange_id: int):
-    async with create_db() as database:
+    async with use_worker_db() as database:
         exchange = await read_exchange_by_id(database, exchange_id)
         if not exchange:
             logging.error(
@@ -23,5 +23,4 @@ async def async_fetch_markets(exchange_id: int):
 
 
 def fetch_markets(exchange_id: int):
-    loop = asyncio.get_event_loop()
-    return loop.run_until_complete(async_fetch_markets(exchange_id))
+    return run_sync(async_fetch_markets(exchange_id))
@@ -1,6 +1,7 @@
 import logging
 
 from core.feeds.bittrex.helpers import fetch_markets
+from core.feeds.helpers import serialized_action, fan_out, get_max_workers
 
 
 def bittrex_public_trade_result_generator(configs: dict, **kwargs):
@@ -26,30 +27,40 @@ def bittrex_public_trade_result_generator(configs: dict, **kwargs):
             f"Bittrex Trade Result Generator : Required Config key 'task_limit' is Missing or None"
         )
         return
-    task_counter = 0
-    market_counter = 0
-    market_counters = {}
-    for market in markets:
-        snapshot = exchange.api(exchange).get_trade_sequence(market.symbol)
+
+    def fetch_market_trades(market):
+        api = exchange.api(exchange)
+        snapshot = api.get_trade_sequence(market.symbol)
         if not snapshot:
             logging.error(
                 "Bittrex Trade Result Generator : Trade Sequence is Invalid or None"
             )
-            continue
+            return None
         logging.info(
-            f"Bittrex Trade Result Generator : Fetching Trades : Market Symbol {market.symbol} : Total Trades this Task {task_counter}"
+            f"Bittrex Trade Result Generator : Fetching Trades : Market Symbol {market.symbol}"
         )
+        trades = list(api.generate_public_trades(market.symbol))
+        for trade in trades:
+            trade.snapshot = snapshot
+        return trades
+
+    task_counter = 0
+    market_counters = {}
+    for market, trades in fan_out(
+        markets, fetch_market_trades, get_max_workers(configs)
+    ):
+        if trades is None:
+            continue
         if task_counter > task_limit:
             logging.info(
                 f"Bittrex Trade Result Generator : Reached Task Limit : Limit {task_limit}"
             )
             return
         market_counter = 0
-        for trade in exchange.api(exchange).generate_public_trades(market.symbol):
+        for trade in trades:
             task_counter += 1
             market_counter += 1
-            trade.snapshot = snapshot
-            yield trade.dict(by_alias=True)
+            yield serialized_action(trade)
         logging.info(
             f"Bittrex Trade Result Generator : Market Completed : Market Symbol {market.symbol} : Total Trades on Market {market_counter} : Total Trades this Task {task_counter}"
         )
@@ -1,7 +1,7 @@
-import asyncio
 import logging
 
 from core.feeds.bittrex.helpers import fetch_markets
+from core.feeds.helpers import serialized_action
 
 
 def bittrex_ticker_result_generator(configs: dict, **kwargs):
@@ -21,23 +21,22 @@ def bittrex_ticker_result_generator(configs: dict, **kwargs):
     if not markets:
         logging.error(f"Bittrex Ticker Result Generator : Markets are Missing or None")
         return
-    snapshot = exchange.api(exchange).get_ticker_sequence()
+    api = exchange.api(exchange)
+    snapshot = api.get_ticker_sequence()
     if not snapshot:
         logging.error(
             "Bittrex Ticker Result Generator : Ticker Sequence is Invalid or None"
         )
         return
+    # The bulk endpoint returns every Bittrex market, only index the ones we track
+    market_symbols = {market.symbol for market in markets}
     ticker_count = 0
-    for market in markets:
-        ticker = exchange.api(exchange).get_ticker(market.symbol)
-        if not ticker:
-            logging.error(
-                f"Bittrex Ticker Result Generator : Ticker is None : Market Symbol {market.symbol}"
-            )
+    for ticker in api.get_tickers():
+        if ticker.symbol not in market_symbols:
             continue
         ticker.snapshot = snapshot
         ticker_count += 1
-        yield ticker.dict(by_alias=True)
+        yield serialized_action(ticker)
     logging.info(
-        f"Bittrex Ticker Result Generator : Complete : Total Tickers {ticker_count}"
+        f"Bittrex Ticker Result Generator : Complete : Total Tickers {ticker_count} : Total Markets {len(market_symbols)}"
     )
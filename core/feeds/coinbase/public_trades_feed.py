@@ -1,16 +1,17 @@
-import asyncio
 import logging
 
-from core.database.database import create_db
+from core.database.database import use_worker_db
 from core.database.crud.exchange import read_exchange_by_id
 from core.database.crud.market import read_markets_by_exchange
+from core.database.crud.feed_cursor import read_feed_cursors
 from core.exchanges.coinbase.api import CoinbaseApiHelper
-from core.feeds.helpers import action_wrapper
+from core.utils.runtime import run_sync
+from core.feeds.helpers import serialized_action, fan_out, get_max_workers
 from core.elasticsearch.api import ElasticApiHelper
 
 
 async def fetch_products(exchange_id: int):
-    async with create_db() as database:
+    async with use_worker_db() as database:
         exchange = await read_exchange_by_id(database, exchange_id)
         if not exchange:
             logging.error(
@@ -21,6 +22,12 @@ async def fetch_products(exchange_id: int):
         return {"exchange": exchange, "markets": markets}
 
 
+async def fetch_trade_cursors(exchange_id: int):
+    async with use_worker_db() as database:
+        return await read_feed_cursors(database, exchange_id)
+
+
+# Fallback for markets with no stored cursor yet, seeds the cursor from the newest indexed trade
 def fetch_last_trade_id(es_client, index_name, market_symbol):
     template_name = "coinbase-last-trade-id"
     market_symbol_param_name = "market_symbol"
@@ -35,15 +42,17 @@ def fetch_last_trade_id(es_client, index_name, market_symbol):
         return results[0].get("_source").get("trade_id")
 
 
-def coinbase_public_trade_result_generator(configs: dict, **kwargs):
+# Pass a checkpoints dict to have the newest yielded trade_id per market recorded under checkpoints[exchange_id], the caller persists them once the results are indexed
+def coinbase_public_trade_result_generator(
+    configs: dict, checkpoints: dict = None, **kwargs
+):
     exchange_id = configs.get("exchange_id")
     if not exchange_id:
         logging.error(
             "Coinbase Public Trade Result Generator : Required Exchange ID Missing from Feed Configs"
         )
         return
-    loop = asyncio.get_event_loop()
-    feed_data = loop.run_until_complete(fetch_products(exchange_id))
+    feed_data = run_sync(fetch_products(exchange_id))
     if not feed_data:
         logging.error(
             "Coinbase Public Trade Result Generator : Failed to Fetch Feed Data from Database"
@@ -77,38 +86,50 @@ def coinbase_public_trade_result_generator(configs: dict, **kwargs):
             f"Public Trade Result Generator : Required config key 'task_limit' is missing or None"
         )
         return
-    task_counter = 0
-    market_counter = 0
-    min_trade_id = 0
-    max_trade_id = 0
-    market_counters = {}
-    for market in markets:
-        last_trade_id = fetch_last_trade_id(es_client, index_name, market.symbol)
+
+    cursors = run_sync(fetch_trade_cursors(exchange.id))
+    max_pages = configs.get("max_pages")
+    market_checkpoints = {}
+    if checkpoints is not None:
+        market_checkpoints = checkpoints.setdefault(exchange.id, {})
+
+    def fetch_market_trades(market):
+        last_trade_id = cursors.get(market.symbol)
+        if not last_trade_id:
+            last_trade_id = fetch_last_trade_id(es_client, index_name, market.symbol)
         logging.info(
             f"Public Trade Result Generator : Fetching Trades : Market Symbol {market.symbol} : Last Trade ID {last_trade_id} : Limit {limit}"
         )
-        market_counter = 0
-        min_trade_id = 1000000000
-        max_trade_id = 0
+        trades = list(
+            exchange.api(exchange).generate_public_trade_pages(
+                market.symbol, before=last_trade_id, limit=limit, max_pages=max_pages
+            )
+        )
+        # Oldest first, so stopping at the task limit never leaves a gap below the checkpoint
+        trades.sort(key=lambda trade: trade.trade_id)
+        return trades
 
-        for trade in exchange.api(exchange).generate_public_trades(
-            market.symbol, before=last_trade_id, limit=limit
-        ):
+    task_counter = 0
+    market_counters = {}
+    for market, trades in fan_out(
+        markets, fetch_market_trades, get_max_workers(configs)
+    ):
+        if not trades:
+            continue
+        market_counter = 0
+        for trade in trades:
             task_counter += 1
-            market_counter += 1
             if task_counter > task_limit:
                 logging.info(
                     f"Public Trade Result Generator : Reached Task Limit : Limit {task_limit} : Market Counters {market_counters}"
                 )
                 return
-            if trade.trade_id > max_trade_id:
-                max_trade_id = trade.trade_id
-            if trade.trade_id < min_trade_id:
-                min_trade_id = trade.trade_id
-            yield trade.dict(by_alias=True)
+            market_counter += 1
+            market_checkpoints[market.symbol] = trade.trade_id
+            yield serialized_action(trade)
         market_counters.update({market.symbol: market_counter})
         logging.info(
-            f"Public Trade Result Generator : Market Completed : Symbol {market.symbol} : Min Trade ID {min_trade_id} : Max Trade ID {max_trade_id}"
+            f"Public Trade Result Generator : Market Completed : Symbol {market.symbol} : Min Trade ID {trades[0].trade_id} : Max Trade ID {trades[-1].trade_id}"
         )
     logging.info(
         f"Public Trade Result Generator : All Markets Completed : Market Counters {market_counters}"
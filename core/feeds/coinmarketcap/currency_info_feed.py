@@ -1,5 +1,5 @@
 from core.feeds.coinmarketcap.helpers import get_cmc_session
-from core.feeds.helpers import action_wrapper
+from core.feeds.helpers import serialized_action
 from pydantic import BaseModel, Field, ValidationError
 from typing import List
 from decimal import Decimal
@@ -37,14 +37,17 @@ class CoinMarketCapCurrencyInfoModel(BaseModel):
     market_cap: Decimal = None
     market_cap_dominance: Decimal = None
     fully_diluted_market_cap: Decimal = None
-    price_usd: Decimal = None
+    price_usd: Decimal = Field(None, es_type="scaled_float")
     parent_source_id: int = None
-    token_address: str = None
+    token_address: str = Field(
+        None, es_index=False, es_doc_values=False
+    )  # Kept for reference, never searched or aggregated
     source_last_updated_at: datetime = None
 
     class Config:
         allow_population_by_field_name = True
         extra = "ignore"
+        natural_key = ("id",)  # Currency symbol, each refresh overwrites the currency's document
 
 
 def parse_currency_info_result(result):
@@ -127,7 +130,7 @@ def cmc_currency_result_generator(configs: dict, **kwargs):
         currency_info = parse_currency_info_result(item)
         if currency_info:
             # yield {"_id": currency_info.id, "doc": currency_info.json(exclude={"id"})}
-            yield currency_info.dict(by_alias=True)
+            yield serialized_action(currency_info)
 
 
 def main():
@@ -7,7 +7,7 @@ from core.enums.feed_config import FeedConfig
 from core.database.crud.exchange import sync_read_exchange_by_id
 from core.database.crud.market import sync_read_markets_by_tags
 from core.database.database import get_sync_db
-from core.feeds.helpers import has_required_configs
+from core.feeds.helpers import has_required_configs, serialized_action
 from core.enums.candle_length import CandleLength
 from core.models.candle import CandleModel
 from core.elasticsearch.api import ElasticApiHelper
@@ -104,7 +104,7 @@ def candle_result_generator(configs: dict, index_name: str, **kwargs):
                     result_count += 1
                     start_time = candle.time
                     try:
-                        yield CandleModel(**candle.dict()).dict()
+                        yield serialized_action(CandleModel(**candle.dict()))
                     except ValidationError as ve:
                         logging.error(
                             f"Candle Result Generator : ValidationError : CandleModel : {ve.json()}"
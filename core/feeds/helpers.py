@@ -1,90 +1,263 @@
 import logging
+from datetime import datetime
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from pydantic import parse_obj_as, ValidationError
-from typing import List
+from typing import Callable, Iterable, List
+from core.config import settings
 from core.enums.feed_config import FeedConfig
+from core.elasticsearch.serializers import PreSerializedDoc, dumps_bytes
+from core.elasticsearch.bulk import BulkOpTypes
+from core.models.index_rollover import IndexRolloverModel
 
 
-def action_wrapper(model, exclude=None, use_id=False, by_alias=False):
-    if not use_id:
-        return {"doc": model.json(exclude=exclude, by_alias=by_alias)}
-    else:
-        return {"_id": model.id, "doc": model.json(exclude=exclude, by_alias=by_alias)}
+# Result models declare the fields that identify a document with natural_key in their Config, e.g. ("market_symbol", "trade_id")
+# A retried or overlapping refresh then produces the same _id instead of a duplicate
+def get_natural_key_id(model):
+    natural_key = getattr(model.__config__, "natural_key", None)
+    if not natural_key:
+        return None
+    values = []
+    for field in natural_key:
+        value = getattr(model, field, None)
+        if value is None:
+            logging.error(
+                f"Get Natural Key ID : Natural Key Field is Missing or None : Model {type(model).__name__} : Field {field}"
+            )
+            return None
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        values.append(str(value))
+    return "-".join(values)
 
 
-def get_elastic_property(name: str, schema_data: dict):
-    if not isinstance(name, str):
+# The natural key becomes the document ID, models without one fall back to an id aliased to _id, which stays out of the source either way
+def serialized_action(model):
+    data = model.dict(by_alias=True)
+    doc_id = data.pop("_id", None)
+    return PreSerializedDoc(dumps_bytes(data), get_natural_key_id(model) or doc_id)
+
+
+def get_max_workers(configs: dict):
+    max_workers = configs.get(FeedConfig.MaxWorkers.value)
+    if not isinstance(max_workers, int) or max_workers < 1:
+        return settings.FeedFetchMaxWorkers
+    return max_workers
+
+
+# Per feed overrides for BulkIndexer, anything missing or invalid falls back to the ElasticBulk* settings
+# op_type "create" skips documents whose _id is already indexed, "index" overwrites them
+def get_bulk_options(configs: dict):
+    options = {
+        "chunk_size": configs.get(FeedConfig.BulkChunkSize.value),
+        "max_chunk_bytes": configs.get(FeedConfig.BulkMaxChunkBytes.value),
+        "thread_count": configs.get(FeedConfig.BulkThreadCount.value),
+    }
+    bulk_options = {
+        key: value
+        for key, value in options.items()
+        if isinstance(value, int) and value > 0
+    }
+    op_type = configs.get(FeedConfig.OpType.value)
+    if op_type in BulkOpTypes:
+        bulk_options["op_type"] = op_type
+    elif op_type is not None:
         logging.error(
-            f"Schema to Mappings : Input Name must be a String : Got {type(name)}"
+            f"Get Bulk Options : Unsupported Op Type : Got {op_type} : Expected One of {BulkOpTypes}"
         )
+    return bulk_options
+
+
+# Feeds opt into rollover by setting rollover_period, the other rollover configs are optional
+def get_rollover_options(configs: dict):
+    period = configs.get(FeedConfig.RolloverPeriod.value)
+    if not period:
         return None
-    if not isinstance(schema_data, dict):
+    if configs.get(FeedConfig.OpType.value) == "create":
+        logging.warning(
+            f"Get Rollover Options : op_type create Only Skips Documents in the Current Write Index : Retries Across a Rollover Will Duplicate"
+        )
+    try:
+        return IndexRolloverModel(
+            period=period,
+            max_age=configs.get(FeedConfig.RolloverMaxAge.value),
+            max_size=configs.get(FeedConfig.RolloverMaxSize.value),
+            max_docs=configs.get(FeedConfig.RolloverMaxDocs.value),
+            force_merge_after=configs.get(FeedConfig.ForceMergeAfter.value),
+            retention=configs.get(FeedConfig.Retention.value),
+            number_of_shards=configs.get(FeedConfig.NumberOfShards.value) or 1,
+        )
+    except ValidationError as ve:
         logging.error(
-            f"Schema to Mappings : Schema Data Must be a Dictionary : Got {type(schema_data)}"
+            f"Get Rollover Options : ValidationError : IndexRolloverModel : {ve.json()}"
         )
         return None
-    if name == "_id":
-        return None  # ALways exclude _id from mappings
+
+
+# Runs fetch(item) on a bounded thread pool and yields (item, result) pairs as each one completes
+# Only max_workers fetches are queued at a time, so closing the generator early (e.g. a task limit) leaves the remaining items unfetched
+def fan_out(items: Iterable, fetch: Callable, max_workers: int = None):
+    max_workers = max_workers or settings.FeedFetchMaxWorkers
+    items = iter(items)
+
+    def run_fetch(item):
+        try:
+            return item, fetch(item)
+        except Exception as e:
+            logging.error(f"Feed Fan Out : Fetch Failed : Item {item} : Error {e}")
+            return item, None
+
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="BottifyFeedFetch"
+    ) as executor:
+        pending = set()
+
+        def fill():
+            while len(pending) < max_workers:
+                item = next(items, None)
+                if item is None:
+                    return
+                pending.add(executor.submit(run_fetch, item))
+
+        try:
+            fill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.discard(future)
+                    yield future.result()
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+# Result model fields can steer their mapping with Field extras, pydantic copies them into the schema
+# es_type overrides the inferred type (e.g. "scaled_float", "nested", "text"), es_index=False and es_doc_values=False turn off search or aggregations on the field
+ElasticHintKeys = {"es_index": "index", "es_doc_values": "doc_values"}
+
+elastic_string_formats = {
+    "date-time": "date",
+    "date": "date",
+    "uuid": "keyword",
+    "ipvanyaddress": "ip",
+    "ipv4": "ip",
+    "ipv6": "ip",
+}
+
+
+def resolve_schema_ref(schema_data: dict, definitions: dict):
+    ref = schema_data.get("$ref")
+    if not ref:
+        sub_schemas = schema_data.get("allOf") or schema_data.get("anyOf")
+        if not sub_schemas:
+            return schema_data
+        # Fields with extras around a ref come through as allOf, Optional unions as anyOf with a null member
+        sub_schemas = [sub for sub in sub_schemas if sub.get("type") != "null"]
+        if len(sub_schemas) != 1:
+            return schema_data
+        return resolve_schema_ref(sub_schemas[0], definitions)
+    return definitions.get(ref.split("/")[-1], {})
+
+
+def get_enum_elastic_type(values: list):
+    if values and all(isinstance(value, bool) for value in values):
+        return "boolean"
+    if values and all(isinstance(value, int) for value in values):
+        return "integer"
+    return "keyword"
+
+
+def compile_elastic_type(schema_data: dict, definitions: dict):
+    schema_data = resolve_schema_ref(schema_data, definitions)
+    if "enum" in schema_data:
+        return {"type": get_enum_elastic_type(schema_data.get("enum"))}
     schema_type = schema_data.get("type")
-    if (
-        not schema_type
-    ):  # Null values will be returned as NoneType in model schema, all other types will be returned as strings
-        return {name: {"type": "null"}}
     if schema_type == "integer":
-        return {
-            name: {"type": "integer"}
-        }  # Not necessary but doing it for completeness
-    elif schema_type == "number":
-        return {
-            name: {"type": "double"}
-        }  # This mainly applies to decimal and condecimal types
-    elif schema_type == "string":
+        return {"type": "long"}
+    if schema_type == "number":
+        return {"type": "double"}  # Decimals, hint es_type="scaled_float" for prices and sizes
+    if schema_type == "boolean":
+        return {"type": "boolean"}
+    if schema_type == "string":
         str_fmt = schema_data.get("format")
-        if (
-            not str_fmt
-        ):  # Basic string fields won't have a format key, datetime, timedelta, IPAddress values will
-            return {
-                name: {"type": "keyword"}
-            }  # Will probably need to update this for large bodies of text
-        if str_fmt == "date-time":
-            return {name: {"type": "date"}}
-        else:
-            logging.error(
-                f"Schema to Mappings : Received Unsupported String Format : Schema Data {schema_data}"
+        if not str_fmt:
+            return {"type": "keyword"}
+        if str_fmt not in elastic_string_formats:
+            logging.warning(
+                f"Compile Elastic Type : Unsupported String Format, Mapping as Keyword : Schema Data {schema_data}"
             )
-            return {name: {"type": "keyword"}}
-    elif schema_type == "boolean":
-        return "boolean"  # Once again probably not necessary but w/e
-    elif schema_type == "array":
-        # return {name: {"type": "text"}}
+        return {"type": elastic_string_formats.get(str_fmt, "keyword")}
+    if schema_type == "array":
+        # Elastic has no array type, any field holds a list of its item type
+        return compile_elastic_type(schema_data.get("items", {}), definitions)
+    if schema_type == "object":
+        if "properties" not in schema_data:
+            return {"type": "object", "enabled": False}  # Free form dicts are kept in _source but not indexed
         return {
-            name: {
-                "type": "text",
-                "fields": {"keyword": {"type": "keyword", "ignore_above": 256}},
-            }
+            "type": "object",
+            "properties": compile_elastic_properties(schema_data, definitions),
         }
-    else:
+    logging.warning(
+        f"Compile Elastic Type : Unsupported Schema Type, Storing Without Indexing : Schema Data {schema_data}"
+    )
+    return {"type": "keyword", "index": False, "doc_values": False}
+
+
+def get_elastic_property(name: str, schema_data: dict, definitions: dict = None):
+    if not isinstance(name, str):
+        logging.error(
+            f"Schema to Mappings : Input Name must be a String : Got {type(name)}"
+        )
+        return None
+    if not isinstance(schema_data, dict):
         logging.error(
-            f"Schema to Mappings : Received Unsupported Schema Type : Schema Type {schema_type} : Schema Data {schema_data}"
+            f"Schema to Mappings : Schema Data Must be a Dictionary : Got {type(schema_data)}"
         )
         return None
+    if name == "_id":
+        return None  # ALways exclude _id from mappings
+    es_prop = compile_elastic_type(schema_data, definitions or {})
+    es_type = schema_data.get("es_type")
+    if es_type == "nested":
+        es_prop["type"] = "nested"
+    elif es_type:
+        es_prop = {"type": es_type}
+    if es_prop["type"] == "scaled_float":
+        es_prop["scaling_factor"] = schema_data.get(
+            "es_scaling_factor", settings.ElasticScalingFactor
+        )
+    for hint, param in ElasticHintKeys.items():
+        if hint in schema_data:
+            es_prop[param] = schema_data[hint]
+    return {name: es_prop}
 
 
-def get_mappings(feed):
-    if not feed.result_model:
-        logging.error(f"Set Mappings : Feed's Result Model is None : Feed ID {feed.id}")
-        return None
+def compile_elastic_properties(schema: dict, definitions: dict):
     es_properties = {}
-    for name, data in feed.result_model.schema().get("properties").items():
-        es_prop = get_elastic_property(name, data)
+    for name, data in schema.get("properties", {}).items():
+        es_prop = get_elastic_property(name, data, definitions)
         if not es_prop:
             continue
         es_properties.update(es_prop)
+    return es_properties
+
+
+# Strict mappings reject documents with fields the result model doesn't declare instead of growing the mapping, documents are serialized by alias so the schema is too
+def get_mappings(feed):
+    if not feed.result_model:
+        logging.error(f"Set Mappings : Feed's Result Model is None : Feed ID {feed.id}")
+        return None
+    schema = feed.result_model.schema(by_alias=True)
+    es_properties = compile_elastic_properties(schema, schema.get("definitions", {}))
     if not es_properties:
         logging.error(
             f"Get Mappings : Failed to Map Any Properties from Result Model Schema : Feed ID {feed.id}"
         )
         return None
-    return {"mappings": {"properties": es_properties}}
+    return {"mappings": {"dynamic": "strict", "properties": es_properties}}
 
 
 def has_required_configs(required: list, configs: list):
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from decimal import Decimal
 from datetime import datetime
 from core.enums.candle_length import CandleLength
@@ -8,12 +8,13 @@ class CandleModel(BaseModel):
     exchange_id: int
     market_symbol: str
     length: CandleLength
-    low: Decimal
-    high: Decimal
-    open: Decimal
-    close: Decimal
+    low: Decimal = Field(..., es_type="scaled_float")
+    high: Decimal = Field(..., es_type="scaled_float")
+    open: Decimal = Field(..., es_type="scaled_float")
+    close: Decimal = Field(..., es_type="scaled_float")
     volume: Decimal
     time: datetime
 
     class Config:
         use_enum_values = True
+        natural_key = ("exchange_id", "market_symbol", "length", "time")
@@ -71,6 +71,21 @@ class ExchangeModel(BaseModel):
             raise ValidationError("API is Not Yet Supported for this Exchange Type")
         return api
 
+    @classmethod
+    def from_trusted_row(cls, row):
+        values = dict(row)
+        values["exchange_type"] = Exchange(values["exchange_type"])
+        values["status"] = BottifyStatus(values["status"])
+        auth = values.get("auth")
+        values["auth"] = json.loads(auth) if isinstance(auth, str) else {}
+        values["api"] = map_api(values["exchange_type"])
+        if not values["api"]:
+            logging.error(
+                f"Exchange From Trusted Row : No API For Exchange Type : Exchange Type {values['exchange_type']}"
+            )
+            return None
+        return cls.construct(**values)
+
 
 class ExchangeApiModel(BaseModel):
     id: int
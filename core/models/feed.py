@@ -88,6 +88,7 @@ class FeedModel(BaseModel):
     created_at: datetime = None
     last_execution_at: datetime = None
     next_execution_at: datetime = None
+    lease_expires_at: datetime = None
     result_generator: Callable = None
     result_model: BaseModel = None
     configs: Dict = None
@@ -120,6 +121,17 @@ class FeedModel(BaseModel):
             )
             return None
 
+    @classmethod
+    def from_trusted_row(cls, row):
+        values = dict(row)
+        values["feed_type"] = FeedSources(values["feed_type"])
+        values["status"] = BottifyStatus(values["status"])
+        configs = values.get("configs")
+        values["configs"] = json.loads(configs) if configs else None
+        values["result_generator"] = get_feed_result_generator(values["feed_type"])
+        values["result_model"] = get_feed_result_model(values["feed_type"])
+        return cls.construct(**values)
+
 
 class FeedApiModel(BaseModel):
     id: int = None
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from core.enums.rollover_period import RolloverPeriod
+
+rollover_date_formats = {
+    RolloverPeriod.Daily: ("d", "yyyy.MM.dd", "1d"),
+    RolloverPeriod.Monthly: ("M", "yyyy.MM", "30d"),
+}
+
+
+# Built from feed configs, ages and sizes use Elastic units ("7d", "50gb"), None disables that condition or state
+class IndexRolloverModel(BaseModel):
+    period: RolloverPeriod
+    max_age: str = None
+    max_size: str = None
+    max_docs: int = None
+    force_merge_after: str = None
+    retention: str = None
+    number_of_shards: int = 1
+
+    # Rolls over at least once a period so each backing index covers about one day or month
+    @property
+    def rollover_age(self):
+        return self.max_age or rollover_date_formats[self.period][2]
@@ -1,4 +1,3 @@
-import json
 from pydantic import BaseModel, validator, condecimal
 from datetime import datetime, timezone
 from typing import Optional, List
@@ -23,19 +22,9 @@ class MarketCreateModel(BaseModel):
 class MarketInModel(MarketCreateModel):
     status: BottifyStatus = BottifyStatus.Active
     notice: Optional[str] = None
-    tags: Optional[str] = None
     created_at: datetime = datetime.now(tz=timezone.utc)
     updated_at: datetime = datetime.now(tz=timezone.utc)
 
-    @validator("tags", pre=True)
-    def dump_tags(cls, v):
-        if isinstance(v, list):
-            return json.dumps(v)
-        elif isinstance(v, str):
-            return v
-        else:
-            return None
-
     class Config:
         use_enum_values = True
 
@@ -49,14 +38,22 @@ class MarketModel(MarketCreateModel):
 
     @validator("tags", pre=True)
     def load_tags(cls, v):
-        if isinstance(v, str):
-            return json.loads(v)
+        if isinstance(v, (list, tuple)):
+            return list(v)
         else:
             return None
 
     class Config:
         use_enum_values = False
 
+    @classmethod
+    def from_trusted_row(cls, row):
+        values = dict(row)
+        values["status"] = BottifyStatus(values["status"])
+        tags = values.get("tags")
+        values["tags"] = list(tags) if tags else None
+        return cls.construct(**values)
+
 
 class MarketUpdateModel(BaseModel):
     symbol: str
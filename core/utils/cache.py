@@ -0,0 +1,69 @@
+import threading
+import time
+
+
+# Small in-process read-through cache, entries expire ttl seconds after they were stored
+class TTLCache:
+    def __init__(self, ttl: float, max_size: int = None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0  # Bumped by every invalidate, see set_if_generation
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                self.misses += 1
+                return default
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.store(key, value)
+
+    # For read-through callers that await the source, read generation before the read and pass it here so an invalidation that landed mid-read isn't overwritten with the stale value
+    def set_if_generation(self, key, value, generation: int):
+        with self.lock:
+            if self.generation != generation:
+                return False
+            self.store(key, value)
+            return True
+
+    # Callers hold the lock
+    def store(self, key, value):
+        if self.max_size and len(self.entries) >= self.max_size:
+            self.evict_expired()
+            if len(self.entries) >= self.max_size:
+                # Oldest insert goes first, dicts keep insertion order
+                self.entries.pop(next(iter(self.entries)))
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+
+    def evict_expired(self):
+        now = time.monotonic()
+        expired = [
+            key for key, (expires_at, _) in self.entries.items() if expires_at <= now
+        ]
+        for key in expired:
+            del self.entries[key]
+
+    def invalidate(self, key=None):
+        with self.lock:
+            self.generation += 1
+            if key is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(key, None)
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries)}
@@ -0,0 +1,48 @@
+import logging
+import threading
+import time
+import redis
+
+from core.config import settings
+
+logger = logging.getLogger("Bottify.PubSub")
+
+# Published by workers and subscribed to by the API process, messages carry the monitor source_id to drop
+MonitorCacheChannel = "bottify:monitor-cache"
+
+
+def get_redis_client():
+    return redis.Redis.from_url(str(settings.CeleryBroker))
+
+
+def publish_invalidation(channel: str, key: str):
+    try:
+        get_redis_client().publish(channel, key)
+    except redis.RedisError as re:
+        logger.error(
+            f"Publish Invalidation : RedisError : Channel {channel} : Key {key} : {re}"
+        )
+
+
+# Calls callback(key) for every message on channel from a daemon thread, callback(None) after (re)connecting since messages may have been missed
+def start_invalidation_listener(channel: str, callback, retry_seconds: int = 5):
+    def listen():
+        while True:
+            try:
+                pubsub = get_redis_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(channel)
+                callback(None)
+                for message in pubsub.listen():
+                    data = message.get("data")
+                    callback(data.decode() if isinstance(data, bytes) else data)
+            except redis.RedisError as re:
+                logger.error(
+                    f"Invalidation Listener : RedisError : Channel {channel} : Retrying in {retry_seconds}s : {re}"
+                )
+                time.sleep(retry_seconds)
+
+    thread = threading.Thread(
+        target=listen, name=f"BottifyInvalidation-{channel}", daemon=True
+    )
+    thread.start()
+    return thread
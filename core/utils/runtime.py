@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import threading
+
+
+# Keeps one long-lived event loop per process running on a background thread, Celery tasks submit their coroutines to it so pools, sessions and caches bound to the loop survive between tasks
+class WorkerRuntime:
+    def __init__(self):
+        self.logger = logging.getLogger("Bottify.WorkerRuntime")
+        self.loop = None
+        self.thread = None
+        self.lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        return self.loop is not None and self.loop.is_running()
+
+    def start(self):
+        with self.lock:
+            if self.loop is not None:
+                return self.loop
+            self.loop = asyncio.new_event_loop()
+            self.thread = threading.Thread(
+                target=self.run_loop, name="BottifyWorkerLoop", daemon=True
+            )
+            self.thread.start()
+            self.logger.info("Worker Runtime : Event Loop Started")
+            return self.loop
+
+    def run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def in_loop_thread(self):
+        return self.thread is not None and threading.current_thread() is self.thread
+
+    # Blocks the calling thread until the coroutine completes on the runtime loop
+    def submit(self, coro, timeout: float = None):
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError(
+                "Worker Runtime : Submit Called from the Event Loop Thread : Await the Coroutine Instead"
+            )
+        self.start()
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return future.result(timeout)
+
+    def stop(self):
+        with self.lock:
+            if self.loop is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+            self.loop.close()
+            self.loop = None
+            self.thread = None
+            self.logger.info("Worker Runtime : Event Loop Stopped")
+
+
+worker_runtime = WorkerRuntime()
+
+
+def get_worker_runtime():
+    return worker_runtime
+
+
+# Used by sync code (Celery tasks, feed result generators running in executor threads) to run a coroutine on the worker loop
+def run_sync(coro, timeout: float = None):
+    return worker_runtime.submit(coro, timeout)
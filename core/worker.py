@@ -1,7 +1,7 @@
 import asyncio
 import logging
-import requests
 from celery import Celery
+from celery.signals import worker_process_init, worker_process_shutdown
 from kombu import Queue
 from typing import List, Dict, Optional
 from pydantic import ValidationError, BaseModel
@@ -23,8 +23,16 @@ from core.engine.orders import async_work_place_order, async_work_refresh_open_o
 from core.engine.monitor import async_work_refresh_monitor
 from datetime import datetime, timedelta
 from databases import Database
-from core.database.database import get_db, create_db
-from core.engine.feeds import async_work_refresh_feed
+from core.database.database import (
+    get_db,
+    create_db,
+    connect_worker_db,
+    disconnect_worker_db,
+)
+from core.engine.feeds import (
+    async_work_refresh_feed,
+    async_work_refresh_overdue_feeds,
+)
 from core.models.feed import FeedWorkerModel
 from core.database.crud.feeds import (
     read_feed_by_id,
@@ -46,9 +54,8 @@ from core.database.crud.balance import (
 from core.database.crud.market import read_market_by_id
 from core.config import settings
 from core.elasticsearch.utils import bulk_index
-import nest_asyncio  # Required in order to call and execute async tasks from inside a running event loop
-
-nest_asyncio.apply()
+from core.utils.runtime import get_worker_runtime, run_sync
+from core.exchanges.sessions import close_client_sessions
 
 bottify_worker = Celery(settings.CeleryWorkerName)
 bottify_worker.conf.broker_url = str(settings.CeleryBroker)
@@ -64,6 +71,9 @@ bottify_worker.conf.task_routes = {
     "core.worker.refresh_feed": {
         "queue": "feed_tasks",
     },
+    "core.worker.refresh_overdue_feeds": {
+        "queue": "feed_tasks",
+    },
     "core.worker.refresh_user_balances": {
         "queue": "trade_tasks",
     },
@@ -73,40 +83,60 @@ bottify_worker.conf.task_routes = {
     "core.worker.refresh_open_orders": {
         "queue": "trade_tasks",
     },
-    "core.worker.refresh_overdue_feeds": {"queue": "main"},
 }
 
 bottify_worker.task_default_exchange_type = settings.CeleryDefaultExchangeType
 bottify_worker.autodiscover_tasks()
 
+# Each worker process keeps one event loop alive for its whole lifetime, the shared Database pool is bound to it so every task runs there
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    get_worker_runtime().start()
+    run_sync(connect_worker_db())
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    runtime = get_worker_runtime()
+    if not runtime.is_running:
+        return
+    run_sync(close_client_sessions())
+    run_sync(disconnect_worker_db())
+    runtime.stop()
+
 
 @bottify_worker.task()
 def refresh_feed(feed_id: int):
 
     if isinstance(feed_id, list):
         feed_id = feed_id[0]
-    loop = asyncio.new_event_loop()
-    loop.run_until_complete(async_work_refresh_feed(feed_id))
+    run_sync(async_work_refresh_feed(feed_id))
     logging.info(f"Refresh Feed : Feed ID {feed_id}")
 
 
+@bottify_worker.task()
+def refresh_overdue_feeds(limit: int = 1):
+    refreshed = run_sync(async_work_refresh_overdue_feeds(limit))
+    logging.info(f"Refresh Overdue Feeds : Feed IDs {refreshed}")
+
+
 @bottify_worker.task()
 def refresh_exchange_balances(exchange_id: int):
     if isinstance(exchange_id, list):
         exchange_id = exchange_id[0]
-    success = asyncio.run(async_work_update_exchange_balances(exchange_id))
+    success = run_sync(async_work_update_exchange_balances(exchange_id))
 
 
 @bottify_worker.task()
 def refresh_user_balances(user_id: int):
     if isinstance(user_id, list):
         user_id = user_id[0]
-    success = asyncio.run(async_work_update_user_balances(user_id))
+    success = run_sync(async_work_update_user_balances(user_id))
 
 
 @bottify_worker.task()
 def refresh_all_markets():
-    asyncio.run(async_work_update_all_markets())
+    run_sync(async_work_update_all_markets())
 
 
 @bottify_worker.task()
@@ -120,7 +150,7 @@ def place_order(order_in: str):
             f"Place Order : BottifyOrderCreateModel : ValidationError : {ve.json()}"
         )
         return
-    asyncio.run(async_work_place_order(new_order))
+    run_sync(async_work_place_order(new_order))
 
 
 @bottify_worker.task()
@@ -129,7 +159,7 @@ def sync_monitor(monitor_source_id: str):
         monitor_source_id, list
     ):  # Doing this allows the task to work with both args and kwargs
         monitor_source_id = monitor_source_id[0]
-    asyncio.run(async_work_refresh_monitor(monitor_source_id))
+    run_sync(async_work_refresh_monitor(monitor_source_id))
 
 
 @bottify_worker.task()
@@ -139,25 +169,12 @@ def handle_reaction(reaction_id: int, strategy_id: int, alert_in: str):
     except ValidationError as ve:
         logging.error(f"Handle Reaction : AlertInModel : ValidationError : {ve.json()}")
         return
-    asyncio.run(async_work_handle_reaction(reaction_id, strategy_id, alert))
+    run_sync(async_work_handle_reaction(reaction_id, strategy_id, alert))
 
 
 @bottify_worker.task()
 def refresh_open_orders():
-    asyncio.run(async_work_refresh_open_orders())
-
-
-@bottify_worker.task()
-def refresh_overdue_feeds():
-    response = requests.get("http://127.0.0.1:8000/api/v1/feeds/overdue", timeout=30)
-    feed_count = 0
-    for feed in response.json():
-        feed_count += 1
-        params = {"feed_id": feed["id"]}
-        bottify_worker.send_task(
-            "core.worker.refresh_feed", kwargs=params, queue="feed_tasks"
-        )
-    logging.info(f"Refresh Overdue Feeds : Complete : Refreshed {feed_count} Feeds")
+    run_sync(async_work_refresh_open_orders())
 
 
 bottify_worker.conf.beat_schedule = {
@@ -166,8 +183,4 @@ bottify_worker.conf.beat_schedule = {
         "schedule": 60.0,
     },
     "refresh-markets": {"task": "core.worker.refresh_all_markets", "schedule": 600.0},
-    "refresh_overdue_feeds": {
-        "task": "core.worker.refresh_overdue_feeds",
-        "schedule": 60.0,
-    },
 }
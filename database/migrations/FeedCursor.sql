@@ -0,0 +1,9 @@
+-- Pagination cursors for exchange feeds, see core/database/tables/feed_cursor.py
+CREATE TABLE IF NOT EXISTS feed_cursor (
+    id SERIAL PRIMARY KEY,
+    exchange_id INTEGER NOT NULL REFERENCES exchange (id),
+    market_symbol VARCHAR(50) NOT NULL,
+    last_id BIGINT NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    CONSTRAINT feed_cursor_uc UNIQUE (exchange_id, market_symbol)
+);
@@ -0,0 +1,2 @@
+-- Lease held by the worker refreshing a feed, see claim_overdue_feeds (scheduled refreshes) and claim_feed (single feed refreshes) in core/database/crud/feeds.py
+ALTER TABLE feed ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
@@ -0,0 +1,9 @@
+-- Composite indexes declared in core/database/tables/ for the hot crud lookups, check them with python -m core.database.query_audit
+CREATE INDEX IF NOT EXISTS feed_status_next_execution_idx ON feed (status, next_execution_at);
+CREATE INDEX IF NOT EXISTS market_base_quote_exchange_idx ON market (base_currency_id, quote_currency_id, exchange_id);
+CREATE INDEX IF NOT EXISTS exchange_user_status_idx ON exchange (user_id, status);
+CREATE INDEX IF NOT EXISTS reaction_monitor_idx ON reaction (monitor_id);
+CREATE INDEX IF NOT EXISTS subscription_strategy_idx ON subscription (strategy_id);
+CREATE INDEX IF NOT EXISTS budget_strategy_idx ON budget (strategy_id);
+CREATE INDEX IF NOT EXISTS budget_exchange_idx ON budget (exchange_id);
+CREATE INDEX IF NOT EXISTS bottify_order_status_idx ON bottify_order (status);
@@ -0,0 +1,2 @@
+-- Required by upsert_markets, ON CONFLICT (exchange_id, symbol) needs a matching unique constraint
+ALTER TABLE market ADD CONSTRAINT market_uc UNIQUE (exchange_id, symbol);
@@ -0,0 +1,26 @@
+-- Moves market.tags from a JSON encoded Text column to varchar[] with a GIN index, tag filters in crud/market.py use the && operator
+-- ALTER COLUMN ... USING can't contain a subquery, so the array is built in a new column and swapped in
+BEGIN;
+-- Postgres doesn't promise to evaluate WHERE conditions in order, so the cast is guarded here instead, rows that aren't a JSON array come back NULL
+CREATE FUNCTION pg_temp.market_tags_to_array(tags TEXT) RETURNS VARCHAR[] AS $$
+DECLARE
+    parsed JSONB;
+BEGIN
+    parsed := tags::jsonb;
+    IF jsonb_typeof(parsed) <> 'array' THEN
+        RETURN NULL;
+    END IF;
+    RETURN ARRAY(SELECT jsonb_array_elements_text(parsed));
+EXCEPTION WHEN invalid_text_representation THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+ALTER TABLE market ADD COLUMN tags_array VARCHAR[];
+UPDATE market
+SET tags_array = pg_temp.market_tags_to_array(tags)
+WHERE tags IS NOT NULL AND tags <> '';
+ALTER TABLE market DROP COLUMN tags;
+ALTER TABLE market RENAME COLUMN tags_array TO tags;
+CREATE INDEX market_tags_idx ON market USING gin (tags);
+DROP FUNCTION pg_temp.market_tags_to_array(TEXT);
+COMMIT;
@@ -6,6 +6,7 @@ import uvicorn
 
 from core.api.api import api_router
 from core.database.database import get_db
+from core.api.cache import start_monitor_cache_listener
 from core.config import settings
 
 app = FastAPI(title=settings.ProjectName, openapi_url=settings.OpenApiUrlPrefix)
@@ -16,6 +17,7 @@ app.include_router(api_router, prefix=settings.ApiPrefix)
 async def startup():
     database = get_db()
     await database.connect()
+    start_monitor_cache_listener()
 
 
 @app.on_event("shutdown")
@@ -0,0 +1,28 @@
+import asyncio
+import logging
+import signal
+
+from core.database.database import create_db
+from core.engine.scheduler import FeedScheduler
+
+
+async def run_scheduler():
+    database = create_db()
+    await database.connect()
+    scheduler = FeedScheduler(database)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, scheduler.stop)
+    try:
+        await scheduler.run()
+    finally:
+        await database.disconnect()
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_scheduler())
+
+
+if __name__ == "__main__":
+    main()